@@ -0,0 +1,6 @@
+"""Repository paths, resolved once at import."""
+
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = REPO_ROOT / "data"
@@ -4,26 +4,28 @@ Usage:
     python -m src.dashboard
 """
 
-import json
+import heapq
 import logging
+from collections import Counter
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
+
+import ciso8601
+import numpy as np
 
 from src.market import MarketStore
 from src.signals import SignalStore
 from src.matching import MatchEngine
+from src.matching.filtered import filter_matches
 from src.paper_trading import PaperTrader
 
-DATA_DIR = Path(__file__).resolve().parents[2] / "data"
-MATCH_LOG = DATA_DIR / "match_log.json"
-CONFIDENCE_THRESHOLD = 0.6
+BANNER = "=" * 60
+SEP = "-" * 40
 
 
 def _fmt_duration(td):
-    total_seconds = int(td.total_seconds())
-    days = total_seconds // 86400
-    hours = (total_seconds % 86400) // 3600
-    minutes = (total_seconds % 3600) // 60
+    days, rem = divmod(int(td.total_seconds()), 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes = rem // 60
     if days > 0:
         return f"{days}d {hours}h {minutes}m"
     if hours > 0:
@@ -31,12 +33,42 @@ def _fmt_duration(td):
     return f"{minutes}m"
 
 
-def _load_match_log():
-    if not MATCH_LOG.exists():
-        return []
-    with open(MATCH_LOG, "r") as f:
-        data = json.load(f)
-    return data.get("matches", [])
+def _count_since(timestamps, cutoff):
+    """Count ISO-8601 timestamps at or after ``cutoff`` (an aware UTC datetime).
+
+    UTC timestamps (``+00:00`` / ``Z`` suffix, as written by the stores) are
+    compared in one vectorised numpy pass; anything else is parsed one at a
+    time with ciso8601.
+    """
+    utc, other = [], []
+    for ts in timestamps:
+        if not ts:
+            continue
+        if ts.endswith("+00:00"):
+            utc.append(ts[:-6])
+        elif ts.endswith("Z"):
+            utc.append(ts[:-1])
+        else:
+            other.append(ts)
+
+    count = 0
+    if utc:
+        try:
+            arr = np.array(utc, dtype="datetime64[us]")
+            count += int((arr >= np.datetime64(cutoff.replace(tzinfo=None), "us")).sum())
+        except ValueError:
+            other.extend(utc)  # malformed row somewhere — reparse one by one
+
+    for ts in other:
+        try:
+            t = ciso8601.parse_datetime(ts)
+            if t.tzinfo is None:
+                t = t.replace(tzinfo=timezone.utc)
+            if t >= cutoff:
+                count += 1
+        except (ValueError, TypeError):
+            pass
+    return count
 
 
 def main():
@@ -53,8 +85,6 @@ def main():
     signal_store = SignalStore()
     signal_store.load()
 
-    matches = _load_match_log()
-
     signal_store_for_engine = SignalStore()
     engine = MatchEngine(market_store, signal_store_for_engine)
     trader = PaperTrader(market_store, engine)
@@ -66,76 +96,65 @@ def main():
     cutoff_24h = now - timedelta(hours=24)
 
     # Headlines in last 24h
-    recent_headlines = 0
-    for h in signal_store.headlines:
-        ts = h.get("fetched_at") or h.get("published", "")
-        if ts:
-            try:
-                t = datetime.fromisoformat(ts)
-                if t.tzinfo is None:
-                    t = t.replace(tzinfo=timezone.utc)
-                if t >= cutoff_24h:
-                    recent_headlines += 1
-            except (ValueError, TypeError):
-                pass
+    recent_headlines = _count_since(
+        [h.get("fetched_at") or h.get("published", "") for h in signal_store.headlines],
+        cutoff_24h,
+    )
 
     # Match stats
+    trade_keys = frozenset((t["market_id"], t["headline"]) for t in trader._trades)
+    matches = filter_matches(trade_keys)
     total_matches = len(matches)
-    matches_with_trade = 0
-    matches_without_trade = 0
-    trade_keys = {(t["market_id"], t["headline"]) for t in trader._trades}
-
-    for m in matches:
-        llm = m.get("llm_assessment")
-        if not llm or not llm.get("relevant"):
-            matches_without_trade += 1
-            continue
-        if (llm.get("confidence") or 0) < CONFIDENCE_THRESHOLD:
-            matches_without_trade += 1
-            continue
-        market = m.get("market", {})
-        mid = market.get("id", market.get("conditionId", ""))
-        headline = m.get("headline", {}).get("title", "")
-        if (mid, headline) in trade_keys:
-            matches_with_trade += 1
-        else:
-            matches_without_trade += 1
+    matches_with_trade = sum(1 for *_, became_trade in matches if became_trade)
+    matches_without_trade = total_matches - matches_with_trade
 
     # Trade performance — all trades (open + closed)
     total_trades = len(trader._trades)
     skipped_count = len(trader._skipped)
-    open_results = [r for r in trade_results if r["trade"]["status"] == "open"]
-    closed_results = [r for r in trade_results if r["trade"]["status"] == "closed"]
-
-    if trade_results:
-        wins = sum(1 for r in trade_results if r["pnl_usd"] > 0)
-        losses = sum(1 for r in trade_results if r["pnl_usd"] < 0)
-        flat = len(trade_results) - wins - losses
-        win_rate = (wins / len(trade_results)) * 100
-        avg_return = sum(r["pnl_pct"] for r in trade_results) / len(trade_results)
-        total_pnl = sum(r["pnl_usd"] for r in trade_results)
-        avg_held_s = sum(r["time_held"].total_seconds() for r in trade_results) / len(trade_results)
-        avg_held = timedelta(seconds=avg_held_s)
+
+    # Single pass over results: status counts, P&L aggregates, exit reasons
+    open_n = closed_n = 0
+    wins = losses = 0
+    total_pnl = pct_sum = held_s_sum = 0
+    exit_reasons = Counter()
+    for r in trade_results:
+        trade = r["trade"]
+        status = trade["status"]
+        if status == "open":
+            open_n += 1
+        elif status == "closed":
+            closed_n += 1
+            reason = trade.get("exit_reason", "unknown")
+            exit_reasons[reason] += 1
+
+        pnl = r["pnl_usd"]
+        if pnl > 0:
+            wins += 1
+        elif pnl < 0:
+            losses += 1
+        total_pnl += pnl
+        pct_sum += r["pnl_pct"]
+        held_s_sum += r["time_held"].total_seconds()
+
+    n_results = len(trade_results)
+    flat = n_results - wins - losses
+    if n_results:
+        win_rate = (wins / n_results) * 100
+        avg_return = pct_sum / n_results
+        avg_held = timedelta(seconds=held_s_sum / n_results)
     else:
-        wins = losses = flat = 0
-        win_rate = avg_return = total_pnl = 0
+        win_rate = avg_return = 0
         avg_held = timedelta()
 
-    # Exit reason breakdown
-    exit_reasons = {}
-    for r in closed_results:
-        reason = r["trade"].get("exit_reason", "unknown")
-        exit_reasons[reason] = exit_reasons.get(reason, 0) + 1
-
     # ── Print dashboard ──────────────────────────────────────────────
     print()
-    print("=" * 60)
+    print(BANNER)
     print("  Polymarket Signal Chaser — Dashboard")
-    print("=" * 60)
+    print(BANNER)
 
     print()
     print("  Pipeline Overview")
-    print("  " + "-" * 40)
+    print("  " + SEP)
     print(f"  Active markets:          {market_store.count}")
     print(f"  Headlines (last 24h):    {recent_headlines}")
     print(f"  Headlines (total):       {signal_store.count}")
@@ -147,10 +166,10 @@ def main():
 
     print()
     print("  Paper Trade Performance")
-    print("  " + "-" * 40)
+    print("  " + SEP)
     if total_trades > 0:
-        print(f"  Open trades:     {len(open_results)}")
-        print(f"  Closed trades:   {len(closed_results)}")
+        print(f"  Open trades:     {open_n}")
+        print(f"  Closed trades:   {closed_n}")
         if exit_reasons:
             reason_str = ", ".join(f"{v} {k}" for k, v in sorted(exit_reasons.items()))
             print(f"  Exit reasons:    {reason_str}")
@@ -164,19 +183,16 @@ def main():
 
     # ── 5 Most Recent Trades ─────────────────────────────────────────
     print()
-    print("=" * 60)
+    print(BANNER)
     print("  5 Most Recent Paper Trades")
-    print("=" * 60)
+    print(BANNER)
 
     if not trade_results:
         print("\n  No paper trades to display.")
         print("  Run `python -m src.paper_trading.log` to log trades.")
     else:
-        sorted_results = sorted(
-            trade_results,
-            key=lambda r: r["trade"]["timestamp"],
-            reverse=True,
-        )[:5]
+        # ISO-8601 UTC timestamps order correctly as strings
+        sorted_results = heapq.nlargest(5, trade_results, key=lambda r: r["trade"]["timestamp"])
 
         for i, r in enumerate(sorted_results, 1):
             t = r["trade"]
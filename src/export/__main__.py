@@ -5,34 +5,26 @@ Usage:
 """
 
 import csv
-import json
 import logging
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
 
+import ciso8601
+
+from src._paths import DATA_DIR
 from src.market import MarketStore
 from src.signals import SignalStore
 from src.matching import MatchEngine
+from src.matching.filtered import filter_matches
 from src.paper_trading import PaperTrader
 
-DATA_DIR = Path(__file__).resolve().parents[2] / "data"
-MATCH_LOG = DATA_DIR / "match_log.json"
-CONFIDENCE_THRESHOLD = 0.6
-
-
-def _load_match_log():
-    if not MATCH_LOG.exists():
-        return []
-    with open(MATCH_LOG, "r") as f:
-        data = json.load(f)
-    return data.get("matches", [])
+BANNER = "=" * 60
+CSV_BUFFER_SIZE = 1 << 20
 
 
 def _fmt_duration(td):
-    total_seconds = int(td.total_seconds())
-    days = total_seconds // 86400
-    hours = (total_seconds % 86400) // 3600
-    minutes = (total_seconds % 3600) // 60
+    days, rem = divmod(int(td.total_seconds()), 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes = rem // 60
     if days > 0:
         return f"{days}d {hours}h {minutes}m"
     if hours > 0:
@@ -43,15 +35,14 @@ def _fmt_duration(td):
 def export_markets(market_store, out_dir):
     """Write markets.csv — all monitored markets with current prices."""
     path = out_dir / "markets.csv"
-    markets = market_store.markets
 
-    with open(path, "w", newline="") as f:
+    with open(path, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
         writer = csv.writer(f)
         writer.writerow([
             "market_id", "question", "outcomes", "outcome_prices",
             "volume", "liquidity", "start_date", "end_date",
         ])
-        for m in markets:
+        for m in market_store.iter_markets():
             outcomes = m.get("outcomes", [])
             prices = m.get("outcomePrices", [])
             outcome_str = " / ".join(str(o) for o in outcomes)
@@ -67,7 +58,7 @@ def export_markets(market_store, out_dir):
                 m.get("endDate", m.get("endDateIso", "")),
             ])
 
-    print(f"  markets.csv    — {len(markets)} rows")
+    print(f"  markets.csv    — {market_store.count} rows")
     return path
 
 
@@ -76,7 +67,7 @@ def export_signals(signal_store, out_dir):
     path = out_dir / "signals.csv"
     headlines = signal_store.headlines
 
-    with open(path, "w", newline="") as f:
+    with open(path, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
         writer = csv.writer(f)
         writer.writerow([
             "title", "url", "source", "published", "fetched_at",
@@ -94,31 +85,25 @@ def export_signals(signal_store, out_dir):
     return path
 
 
-def export_matches(matches, trade_keys, out_dir):
-    """Write matches.csv — all matches with embedding score, LLM assessment, trade status."""
+def export_matches(matches, out_dir):
+    """Write matches.csv — all matches with embedding score, LLM assessment, trade status.
+
+    ``matches`` is the output of ``filter_matches``.
+    """
     path = out_dir / "matches.csv"
 
-    with open(path, "w", newline="") as f:
+    with open(path, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
         writer = csv.writer(f)
         writer.writerow([
             "headline", "market_id", "market_question", "embedding_score",
             "llm_relevant", "llm_direction", "llm_confidence", "llm_reasoning",
             "became_trade", "matched_at",
         ])
-        for m in matches:
-            headline = m.get("headline", {}).get("title", "")
-            market = m.get("market", {})
-            mid = market.get("id", market.get("conditionId", ""))
-            llm = m.get("llm_assessment") or {}
-
-            became_trade = False
-            if llm.get("relevant") and (llm.get("confidence") or 0) >= CONFIDENCE_THRESHOLD:
-                became_trade = (mid, headline) in trade_keys
-
+        for m, mid, headline, llm, became_trade in matches:
             writer.writerow([
                 headline,
                 mid,
-                market.get("question", ""),
+                (m.get("market") or {}).get("question", ""),
                 m.get("embedding_score", ""),
                 llm.get("relevant", ""),
                 llm.get("direction", ""),
@@ -137,7 +122,7 @@ def export_trades(trader, out_dir):
     path = out_dir / "trades.csv"
     now = datetime.now(timezone.utc)
 
-    with open(path, "w", newline="") as f:
+    with open(path, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
         writer = csv.writer(f)
         writer.writerow([
             "trade_id", "timestamp", "market_id", "market_title", "headline",
@@ -156,7 +141,7 @@ def export_trades(trader, out_dir):
                 current_price = t["entry_price"]
                 pnl_usd = 0
                 pnl_pct = 0
-                trade_time = datetime.fromisoformat(t["timestamp"])
+                trade_time = ciso8601.parse_datetime(t["timestamp"])
                 held = now - trade_time
 
             outcome = "WIN" if pnl_usd > 0 else ("LOSS" if pnl_usd < 0 else "FLAT")
@@ -195,9 +180,9 @@ def main():
     )
 
     print()
-    print("=" * 60)
+    print(BANNER)
     print("  Polymarket Signal Chaser — CSV Export")
-    print("=" * 60)
+    print(BANNER)
 
     # Load all data
     market_store = MarketStore()
@@ -206,14 +191,13 @@ def main():
     signal_store = SignalStore()
     signal_store.load()
 
-    matches = _load_match_log()
-
     signal_store_for_engine = SignalStore()
     engine = MatchEngine(market_store, signal_store_for_engine)
     trader = PaperTrader(market_store, engine)
     trader.load_trades()
 
-    trade_keys = {(t["market_id"], t["headline"]) for t in trader._trades}
+    trade_keys = frozenset((t["market_id"], t["headline"]) for t in trader._trades)
+    matches = filter_matches(trade_keys)
 
     # Write CSVs
     DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -221,7 +205,7 @@ def main():
 
     export_markets(market_store, DATA_DIR)
     export_signals(signal_store, DATA_DIR)
-    export_matches(matches, trade_keys, DATA_DIR)
+    export_matches(matches, DATA_DIR)
     export_trades(trader, DATA_DIR)
 
     print(f"\n  Done. All CSVs written to {DATA_DIR}/")
@@ -0,0 +1,30 @@
+"""Shared HTTP session setup for the Polymarket API clients."""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def make_session(pool_size=16):
+    """Return a ``requests.Session`` with retry/backoff and a sized connection pool.
+
+    POST is retried too: the only POSTs we make are the CLOB batch read
+    endpoints, which are idempotent.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "POST"}),
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry,
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,93 @@
+"""Sidecar pickle cache for large JSON / JSON-Lines files, keyed on (mtime_ns, size)."""
+
+import logging
+import os
+import pickle
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Bytes before the parsed offset that must still match for an append-only
+# .jsonl file to be parsed incrementally rather than from scratch
+_TAIL_CHECK = 64
+
+
+def _sidecar_path(path):
+    return path.with_suffix(".cache.pkl")
+
+
+def _parse_lines(raw, path):
+    """Parse the complete JSON lines in ``raw``; return (records, bytes consumed).
+
+    A final line without its newline is an append still in progress (or one
+    that was torn by a crash), so it is left for the next load.
+    """
+    end = raw.rfind(b"\n") + 1
+    if raw[end:].strip():
+        logger.warning("Ignoring unterminated last line in %s", path)
+    loads = orjson.loads
+    return [loads(line) for line in raw[:end].splitlines() if line.strip()], end
+
+
+def load_parsed(path):
+    """Return the parsed contents of the JSON file at ``path``.
+
+    ``.jsonl`` files are parsed line by line into a list (blank lines are
+    skipped). A pickled copy is kept next to the source file. It is reused as
+    long as the source's mtime and size are unchanged; otherwise the file is
+    parsed again and the sidecar rewritten. A ``.jsonl`` file that has only
+    been appended to since is extended from where the last parse stopped.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    sidecar = _sidecar_path(path)
+    jsonl = path.suffix == ".jsonl"
+
+    header = data = None
+    try:
+        with open(sidecar, "rb") as f:
+            header = pickle.load(f)
+            if header[:2] == key:
+                return pickle.load(f)
+            if jsonl and len(header) == 5:
+                data = pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug("Ignoring unreadable parse cache %s: %s", sidecar, e)
+        data = None
+
+    with open(path, "rb") as f:
+        if not jsonl:
+            data = orjson.loads(f.read())
+            header = key
+        else:
+            offset = 0
+            if data is not None:
+                _, _, ino, offset, tail = header
+                f.seek(max(offset - len(tail), 0))
+                if st.st_ino != ino or st.st_size < offset or f.read(len(tail)) != tail:
+                    # Rewritten rather than appended to
+                    data, offset = None, 0
+                    f.seek(0)
+            records, consumed = _parse_lines(f.read(), path)
+            if data is None:
+                data = records
+            else:
+                data.extend(records)
+            offset += consumed
+            f.seek(max(offset - _TAIL_CHECK, 0))
+            tail = f.read(min(offset, _TAIL_CHECK))
+            header = (st.st_mtime_ns, st.st_size, st.st_ino, offset, tail)
+
+    tmp = sidecar.with_name(sidecar.name + ".tmp")
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, sidecar)
+    except OSError as e:
+        logger.debug("Could not write parse cache %s: %s", sidecar, e)
+
+    return data
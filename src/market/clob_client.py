@@ -1,18 +1,24 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
+from ._http import make_session
 
 logger = logging.getLogger(__name__)
 
 CLOB_BASE_URL = "https://clob.polymarket.com"
+BATCH_CHUNK_SIZE = 500
+BATCH_WORKERS = 4
+
+# Shared across client instances so keep-alive connections are reused.
+_SESSION = make_session(pool_size=32)
 
 
 class ClobClient:
     """Client for the Polymarket CLOB API (read-only pricing & order books)."""
 
-    def __init__(self, base_url=CLOB_BASE_URL):
+    def __init__(self, base_url=CLOB_BASE_URL, session=None):
         self.base_url = base_url
-        self.session = requests.Session()
+        self.session = session or _SESSION
 
     # ── Single-token endpoints ──────────────────────────────────────
 
@@ -70,20 +76,40 @@ class ClobClient:
 
     def get_midpoints(self, token_ids):
         """Batch-fetch midpoint prices for multiple tokens."""
-        resp = self.session.post(
-            f"{self.base_url}/midpoints",
-            json=[{"token_id": tid} for tid in token_ids],
-            timeout=30,
-        )
-        resp.raise_for_status()
-        return resp.json()
+        return self._post_batch("/midpoints", [{"token_id": tid} for tid in token_ids])
 
     def get_order_books(self, token_ids):
         """Batch-fetch order books for multiple tokens."""
-        resp = self.session.post(
-            f"{self.base_url}/books",
-            json=[{"token_id": tid} for tid in token_ids],
-            timeout=30,
-        )
-        resp.raise_for_status()
-        return resp.json()
+        return self._post_batch("/books", [{"token_id": tid} for tid in token_ids])
+
+    def _post_batch(self, path, items):
+        """POST ``items`` to a batch endpoint, BATCH_CHUNK_SIZE at a time.
+
+        Chunks are sent concurrently. Dict responses are merged; list
+        responses are concatenated in request order.
+        """
+        chunks = [
+            items[i:i + BATCH_CHUNK_SIZE]
+            for i in range(0, len(items), BATCH_CHUNK_SIZE)
+        ]
+
+        def post(chunk):
+            resp = self.session.post(f"{self.base_url}{path}", json=chunk, timeout=30)
+            resp.raise_for_status()
+            return resp.json()
+
+        if len(chunks) <= 1:
+            return post(chunks[0] if chunks else [])
+
+        with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as pool:
+            parts = list(pool.map(post, chunks))
+
+        if all(isinstance(p, dict) for p in parts):
+            merged = {}
+            for p in parts:
+                merged.update(p)
+            return merged
+        merged = []
+        for p in parts:
+            merged.extend(p)
+        return merged
@@ -1,20 +1,26 @@
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
+import orjson
+
+from ._http import make_session
 
 logger = logging.getLogger(__name__)
 
 GAMMA_BASE_URL = "https://gamma-api.polymarket.com"
 DEFAULT_PAGE_SIZE = 100
+PAGE_WORKERS = 8
+
+# Shared across client instances so keep-alive connections are reused.
+_SESSION = make_session(pool_size=32)
 
 
 class GammaClient:
     """Client for the Polymarket Gamma API (read-only market metadata)."""
 
-    def __init__(self, base_url=GAMMA_BASE_URL):
+    def __init__(self, base_url=GAMMA_BASE_URL, session=None):
         self.base_url = base_url
-        self.session = requests.Session()
+        self.session = session or _SESSION
 
     def fetch_markets(self, limit=DEFAULT_PAGE_SIZE, offset=0, **params):
         """Fetch a single page of markets from the Gamma API."""
@@ -22,47 +28,63 @@ class GammaClient:
         params.update({"limit": limit, "offset": offset})
         resp = self.session.get(url, params=params, timeout=30)
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
 
     def fetch_all_active_markets(self):
-        """Fetch all active, non-closed markets with automatic pagination."""
-        all_markets = []
-        offset = 0
-
-        while True:
+        """Fetch all active, non-closed markets with automatic pagination.
+
+        The first page is fetched on its own; if it is full, the following
+        pages are requested PAGE_WORKERS at a time until a short page shows
+        up. Each page is normalised on the worker that fetched it, so parsing
+        overlaps with the other requests still in flight. Results are merged
+        in offset order.
+        """
+        def fetch_page(offset):
             page = self.fetch_markets(
                 limit=DEFAULT_PAGE_SIZE,
                 offset=offset,
                 active="true",
                 closed="false",
             )
-            if not page:
-                break
-
-            all_markets.extend(page)
-            logger.debug("Fetched %d markets (offset=%d)", len(page), offset)
-
-            if len(page) < DEFAULT_PAGE_SIZE:
-                break
-            offset += DEFAULT_PAGE_SIZE
-
-        return [_parse_market(m) for m in all_markets]
-
-
-def _parse_market(raw):
-    """Normalise a raw Gamma market dict, parsing stringified JSON fields."""
-    market = dict(raw)
-
+            return [_parse_market(m) for m in page]
+
+        first = fetch_page(0)
+        all_markets = list(first)
+        logger.debug("Fetched %d markets (offset=0)", len(first))
+
+        if len(first) == DEFAULT_PAGE_SIZE:
+            offset = DEFAULT_PAGE_SIZE
+            with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as pool:
+                done = False
+                while not done:
+                    offsets = [offset + i * DEFAULT_PAGE_SIZE for i in range(PAGE_WORKERS)]
+                    for off, page in zip(offsets, pool.map(fetch_page, offsets)):
+                        all_markets.extend(page)
+                        logger.debug("Fetched %d markets (offset=%d)", len(page), off)
+                        if len(page) < DEFAULT_PAGE_SIZE:
+                            done = True
+                            break
+                    offset += PAGE_WORKERS * DEFAULT_PAGE_SIZE
+
+        return all_markets
+
+
+def _parse_market(market):
+    """Normalise a raw Gamma market dict in place, parsing stringified JSON fields.
+
+    The dict is freshly decoded from the API response and owned by us, so it
+    is mutated and returned rather than copied.
+    """
     for field in ("outcomes", "outcomePrices", "clobTokenIds"):
         val = market.get(field)
-        if isinstance(val, str):
+        if type(val) is str:
             try:
-                market[field] = json.loads(val)
-            except (json.JSONDecodeError, TypeError):
+                market[field] = orjson.loads(val)
+            except orjson.JSONDecodeError:
                 market[field] = []
 
     # Ensure volumeNum is a float for sorting
-    if "volumeNum" in market:
+    if "volumeNum" in market and type(market["volumeNum"]) is not float:
         try:
             market["volumeNum"] = float(market["volumeNum"])
         except (ValueError, TypeError):
@@ -1,14 +1,19 @@
-import json
+import heapq
 import logging
 import os
 from datetime import datetime, timezone
 from pathlib import Path
 
+import orjson
+
+from src._paths import DATA_DIR
+
+from ._parsed_cache import load_parsed
 from .gamma_client import GammaClient
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data"
+DEFAULT_CACHE_DIR = DATA_DIR
 CACHE_FILENAME = "markets.json"
 
 
@@ -20,6 +25,8 @@ class MarketStore:
         self.cache_path = self.cache_dir / CACHE_FILENAME
         self.gamma = gamma_client or GammaClient()
         self._markets = []
+        self._loaded_key = None  # (mtime_ns, size) of the cache file _markets reflects
+        self._by_id = None
 
     # ── Public API ──────────────────────────────────────────────────
 
@@ -27,18 +34,29 @@ class MarketStore:
         """Fetch all active markets from Gamma and write to the local cache."""
         logger.info("Fetching active markets from Gamma API...")
         self._markets = self.gamma.fetch_all_active_markets()
+        self._by_id = None
         self._save()
         logger.info("Cached %d markets to %s", len(self._markets), self.cache_path)
         return self._markets
 
     def load(self):
-        """Load markets from the local JSON cache file."""
-        if not self.cache_path.exists():
+        """Load markets from the local JSON cache file.
+
+        A no-op if the file hasn't changed since it was last loaded or saved.
+        """
+        try:
+            st = os.stat(self.cache_path)
+        except FileNotFoundError:
             logger.warning("No cache file at %s — call refresh() first", self.cache_path)
             return []
-        with open(self.cache_path, "r") as f:
-            data = json.load(f)
+        key = (st.st_mtime_ns, st.st_size)
+        if key == self._loaded_key:
+            logger.debug("Market cache unchanged, keeping %d loaded markets", len(self._markets))
+            return self._markets
+        data = load_parsed(self.cache_path)
         self._markets = data.get("markets", [])
+        self._loaded_key = key
+        self._by_id = None
         logger.info(
             "Loaded %d markets from cache (updated %s)",
             len(self._markets),
@@ -54,13 +72,24 @@ class MarketStore:
     def count(self):
         return len(self._markets)
 
+    def iter_markets(self):
+        """Yield the cached market dicts without copying the list."""
+        yield from self._markets
+
+    def by_id(self):
+        """Return a {market_id: market} dict, rebuilt only when markets change."""
+        if self._by_id is None:
+            lookup = {}
+            for m in self._markets:
+                mid = m.get("id", m.get("conditionId"))
+                if mid:
+                    lookup[mid] = m
+            self._by_id = lookup
+        return self._by_id
+
     def get_top_by_volume(self, n=10):
         """Return the top N markets sorted by volume descending."""
-        return sorted(
-            self._markets,
-            key=lambda m: m.get("volumeNum", 0),
-            reverse=True,
-        )[:n]
+        return heapq.nlargest(n, self._markets, key=lambda m: m.get("volumeNum", 0))
 
     # ── Internal ────────────────────────────────────────────────────
 
@@ -71,5 +100,10 @@ class MarketStore:
             "count": len(self._markets),
             "markets": self._markets,
         }
-        with open(self.cache_path, "w") as f:
-            json.dump(payload, f, indent=2, default=str)
+        # Compact encoding, written to a temp file and swapped in atomically
+        # so an interrupted refresh can't leave a truncated cache behind.
+        tmp = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        tmp.write_bytes(orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS))
+        os.replace(tmp, self.cache_path)
+        st = os.stat(self.cache_path)
+        self._loaded_key = (st.st_mtime_ns, st.st_size)
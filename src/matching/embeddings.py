@@ -1,58 +1,184 @@
 """Embedding index for semantic matching between headlines and markets."""
 
-import json
 import logging
+import os
 from pathlib import Path
 
 import numpy as np
-from sentence_transformers import SentenceTransformer, util
+import orjson
+
+from src._paths import DATA_DIR
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data"
+DEFAULT_CACHE_DIR = DATA_DIR
 MODEL_NAME = "all-MiniLM-L6-v2"
+# Bump when the on-disk embedding format changes; older caches are rebuilt.
+# v2: rows are stored L2-normalised.
+# v3: index is stored columnar — {"ids": [...], "markets": {id: market}}.
+_CACHE_VERSION = 3
+# "torch" (default) or "onnx" — the latter needs optimum[onnxruntime]
+DEFAULT_BACKEND = os.environ.get("EMBEDDING_BACKEND", "torch")
+ONNX_EXPORT_DIRNAME = "minilm_onnx"
+# Encode batch sizes; larger batches only pay off on an accelerator
+ENCODE_BATCH_SIZE = 64
+QUERY_BATCH_SIZE = 32
+GPU_BATCH_SIZE = 128
+
+
+def _l2_normalize(x):
+    """Scale rows (or a single vector) to unit length."""
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.clip(norms, 1e-12, None)
+
+
+def _pick_device():
+    """Return the best available torch device: cuda, then mps, then cpu."""
+    import torch
+
+    if torch.cuda.is_available():
+        return "cuda"
+    mps = getattr(torch.backends, "mps", None)
+    if mps is not None and mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def _market_text(market):
+    return f"{market.get('question', '')} {market.get('description', '')}".strip()
 
 
 class EmbeddingIndex:
     """Builds and queries a semantic embedding index over Polymarket markets."""
 
-    def __init__(self, cache_dir=None):
+    def __init__(self, cache_dir=None, backend=None):
         self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.backend = backend or DEFAULT_BACKEND
         self._embeddings_path = self.cache_dir / "market_embeddings.npy"
         self._index_path = self.cache_dir / "market_index.json"
         self._model = None
+        self._device = "cpu"
+        # invariant: every row of self._embeddings is a unit vector (encodes use
+        # normalize_embeddings=True, _save_cache renormalises), so scoring is a
+        # dot product rather than a full cosine.
         self._embeddings = None
-        self._index_map = []  # list of market dicts, position matches embedding row
+        self._ids = []  # market id per embedding row
+        self._markets_by_id = {}  # market id -> market dict
 
     def _get_model(self):
         if self._model is None:
-            logger.info("Loading sentence-transformers model: %s", MODEL_NAME)
-            self._model = SentenceTransformer(MODEL_NAME)
+            # Imported here: it pulls in torch, which costs hundreds of ms at
+            # startup for callers (check, dashboard) that never encode.
+            from sentence_transformers import SentenceTransformer
+
+            if self.backend == "onnx":
+                self._model = self._load_onnx_model()
+            if self._model is None:
+                self._device = _pick_device()
+                logger.info("Loading sentence-transformers model: %s (device=%s)", MODEL_NAME, self._device)
+                self._model = SentenceTransformer(MODEL_NAME, device=self._device)
         return self._model
 
+    def _batch_size(self, cpu_batch_size):
+        return GPU_BATCH_SIZE if self._device != "cpu" else cpu_batch_size
+
+    def _load_onnx_model(self):
+        """Load the ONNX Runtime export of the model, exporting it on first use.
+
+        Returns None (so the caller falls back to torch) if the ONNX extras
+        aren't installed or the export fails.
+        """
+        from sentence_transformers import SentenceTransformer
+
+        export_dir = self.cache_dir / ONNX_EXPORT_DIRNAME
+        try:
+            if export_dir.exists():
+                logger.info("Loading ONNX model from %s", export_dir)
+                return SentenceTransformer(str(export_dir), backend="onnx")
+            logger.info("Exporting %s to ONNX (one-off) at %s", MODEL_NAME, export_dir)
+            model = SentenceTransformer(MODEL_NAME, backend="onnx")
+            model.save(str(export_dir))
+            return model
+        except Exception as e:
+            logger.warning("ONNX backend unavailable (%s) — falling back to torch", e)
+            return None
+
     def _load_cache(self):
-        """Load cached embeddings and index from disk. Returns True if cache exists."""
-        if self._embeddings_path.exists() and self._index_path.exists():
-            logger.info("Loading cached market embeddings from %s", self._embeddings_path)
-            self._embeddings = np.load(self._embeddings_path)
-            with open(self._index_path, "r") as f:
-                self._index_map = json.load(f)
-            logger.info("Loaded %d cached market embeddings", len(self._index_map))
-            return True
-        return False
+        """Load cached embeddings and index from disk. Returns True if a current cache exists."""
+        if not (self._embeddings_path.exists() and self._index_path.exists()):
+            return False
+        with open(self._index_path, "rb") as f:
+            index = orjson.loads(f.read())
+        if not isinstance(index, dict) or index.get("version") != _CACHE_VERSION:
+            logger.info("Market embedding cache is from an older format — rebuilding")
+            return False
+        logger.info("Loading cached market embeddings from %s", self._embeddings_path)
+        # Stored rows are already unit vectors. Memory-mapped read-only, so
+        # pages are shared via the OS cache and never copied.
+        self._embeddings = np.load(self._embeddings_path, mmap_mode="r")
+        self._ids = index["ids"]
+        self._markets_by_id = index["markets"]
+        logger.info("Loaded %d cached market embeddings", len(self._ids))
+        return True
 
     def _save_cache(self):
-        """Persist embeddings and index map to disk."""
+        """Persist (normalised) embeddings and index map to disk."""
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        np.save(self._embeddings_path, self._embeddings)
-        with open(self._index_path, "w") as f:
-            json.dump(self._index_map, f)
-        logger.info("Saved %d market embeddings to %s", len(self._index_map), self._embeddings_path)
+        # Write to a new file and swap it in: the old .npy may still be mapped
+        # by this (or another) process, and truncating it in place would fault.
+        tmp = self._embeddings_path.with_name(self._embeddings_path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, _l2_normalize(self._embeddings).astype(np.float32, copy=False))
+        os.replace(tmp, self._embeddings_path)
+        self._embeddings = np.load(self._embeddings_path, mmap_mode="r")
+        self._index_path.write_bytes(orjson.dumps(
+            {"version": _CACHE_VERSION, "ids": self._ids, "markets": self._markets_by_id},
+            default=str,
+        ))
+        logger.info("Saved %d market embeddings to %s", len(self._ids), self._embeddings_path)
+
+    def _score_batch(self, queries, threshold):
+        """Score a (B, d) batch of unit-vector queries against every market.
+
+        Returns a list of B (row_indices, scores) pairs, keeping only rows
+        with cosine >= threshold.
+        """
+        # Rows of self._embeddings are unit vectors, so cosine is a plain dot product
+        sims = queries @ self._embeddings.T
+        results = []
+        for sim_row in sims:
+            rows = np.nonzero(sim_row >= threshold)[0]
+            results.append((rows, sim_row[rows]))
+        return results
+
+    def _encode_markets(self, model, texts):
+        """Batch-encode market texts to unit vectors, rows in input order.
+
+        SentenceTransformer.encode already length-sorts its input into
+        batches and restores the order, so texts are passed through as-is.
+        """
+        return model.encode(
+            texts,
+            batch_size=self._batch_size(ENCODE_BATCH_SIZE),
+            show_progress_bar=True,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
 
     @staticmethod
     def _market_id(market):
         return market.get("id", market.get("conditionId", ""))
 
+    def _set_index(self, ids, markets):
+        """Point embedding rows at ``markets``; ``ids[i]`` names row i.
+
+        Markets without an id get a row-local placeholder key so they still
+        resolve, but never match an incoming market on the next build.
+        """
+        ids = [mid or f"_row{i}" for i, mid in enumerate(ids)]
+        self._ids = ids
+        self._markets_by_id = dict(zip(ids, markets))
+
     def build_market_index(self, markets):
         """Encode market questions and cache to disk.
 
@@ -63,38 +189,36 @@ class EmbeddingIndex:
             markets: List of market dicts with at least a 'question' field.
         """
         has_cache = self._load_cache()
+        incoming_ids = [self._market_id(m) for m in markets]
 
         if has_cache:
-            # Build lookup: cached market_id -> row index
-            cached_id_to_row = {}
-            for i, m in enumerate(self._index_map):
-                mid = self._market_id(m)
-                if mid:
-                    cached_id_to_row[mid] = i
+            # Cached market_id -> row index (placeholder ids never match)
+            id_to_row = {mid: i for i, mid in enumerate(self._ids) if not mid.startswith("_row")}
 
             # Split incoming markets into reusable (cached) and new
-            reuse_rows = []
-            reuse_markets = []
-            new_markets = []
-
-            for m in markets:
-                mid = self._market_id(m)
-                if mid in cached_id_to_row:
-                    reuse_rows.append(cached_id_to_row[mid])
+            reuse_rows, reuse_ids, reuse_markets = [], [], []
+            new_ids, new_markets = [], []
+
+            for mid, m in zip(incoming_ids, markets):
+                row = id_to_row.get(mid) if mid else None
+                if row is not None:
+                    reuse_rows.append(row)
+                    reuse_ids.append(mid)
                     reuse_markets.append(m)
                 else:
+                    new_ids.append(mid)
                     new_markets.append(m)
 
-            if not new_markets and len(reuse_rows) == len(cached_id_to_row):
+            if not new_markets and len(reuse_rows) == len(id_to_row):
                 logger.info("Cache is up to date (%d markets), skipping recomputation", len(markets))
                 return
 
             if not new_markets:
                 # Only need to prune closed markets
                 self._embeddings = self._embeddings[reuse_rows]
-                self._index_map = reuse_markets
+                self._set_index(reuse_ids, reuse_markets)
                 self._save_cache()
-                pruned = len(cached_id_to_row) - len(reuse_rows)
+                pruned = len(id_to_row) - len(reuse_rows)
                 logger.info("Pruned %d closed markets (%d remaining)", pruned, len(reuse_markets))
                 return
 
@@ -104,28 +228,22 @@ class EmbeddingIndex:
                 len(new_markets), len(reuse_rows),
             )
             model = self._get_model()
-            new_texts = [
-                f"{m.get('question', '')} {m.get('description', '')}".strip()
-                for m in new_markets
-            ]
-            new_embeddings = model.encode(new_texts, show_progress_bar=True, convert_to_numpy=True)
+            new_texts = [_market_text(m) for m in new_markets]
+            new_embeddings = self._encode_markets(model, new_texts)
 
             # Merge: reused cached embeddings + newly encoded
             cached_part = self._embeddings[reuse_rows]
             self._embeddings = np.vstack([cached_part, new_embeddings])
-            self._index_map = reuse_markets + new_markets
+            self._set_index(reuse_ids + new_ids, reuse_markets + new_markets)
             self._save_cache()
             return
 
         # No cache at all — full encode
         model = self._get_model()
-        texts = [
-            f"{m.get('question', '')} {m.get('description', '')}".strip()
-            for m in markets
-        ]
+        texts = [_market_text(m) for m in markets]
         logger.info("Encoding %d market titles/descriptions...", len(texts))
-        self._embeddings = model.encode(texts, show_progress_bar=True, convert_to_numpy=True)
-        self._index_map = markets
+        self._embeddings = self._encode_markets(model, texts)
+        self._set_index(incoming_ids, markets)
         self._save_cache()
 
     def find_matches(self, headline_text, threshold=0.65):
@@ -138,18 +256,40 @@ class EmbeddingIndex:
         Returns:
             List of (market_dict, score) tuples sorted by score descending.
         """
-        if self._embeddings is None or len(self._index_map) == 0:
+        return self.find_matches_batch([headline_text], threshold=threshold)[0]
+
+    def find_matches_batch(self, headline_texts, threshold=0.65):
+        """Find matching markets for several headlines with one encode and one GEMM.
+
+        Args:
+            headline_texts: List of headline strings.
+            threshold: Minimum cosine similarity score.
+
+        Returns:
+            One list per headline (same order) of (market_dict, score) tuples
+            sorted by score descending.
+        """
+        if self._embeddings is None or len(self._ids) == 0:
             logger.warning("No market embeddings loaded — call build_market_index first")
+            return [[] for _ in headline_texts]
+        if not headline_texts:
             return []
 
         model = self._get_model()
-        headline_embedding = model.encode(headline_text, convert_to_numpy=True)
-
-        scores = util.cos_sim(headline_embedding, self._embeddings)[0].numpy()
-
-        matches = []
-        for idx in np.where(scores >= threshold)[0]:
-            matches.append((self._index_map[idx], float(scores[idx])))
+        queries = model.encode(
+            list(headline_texts),
+            batch_size=self._batch_size(QUERY_BATCH_SIZE),
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
 
-        matches.sort(key=lambda x: x[1], reverse=True)
-        return matches
+        ids = self._ids
+        markets_by_id = self._markets_by_id
+        all_matches = []
+        for rows, scores in self._score_batch(queries, threshold):
+            order = np.argsort(-scores, kind="stable")
+            all_matches.append([
+                (markets_by_id[ids[idx]], score)
+                for idx, score in zip(rows[order].tolist(), scores[order].tolist())
+            ])
+        return all_matches
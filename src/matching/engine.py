@@ -1,42 +1,76 @@
 """MatchEngine — orchestrates embedding similarity + LLM assessment pipeline."""
 
-import json
+import functools
+import hashlib
 import logging
 import os
-from datetime import datetime, timezone
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
+import orjson
 from dotenv import dotenv_values
 
+from src._paths import DATA_DIR, REPO_ROOT
+
 from .embeddings import EmbeddingIndex
-from .llm import assess_match
+from .llm import RateLimiter, assess_match
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data"
+DEFAULT_CACHE_DIR = DATA_DIR
+LLM_WORKERS = 8
+# Client-side cap on LLM calls; 0 leaves pacing to the SDK, which retries
+# 429s with backoff. Override with the LLM_REQUESTS_PER_MINUTE env var.
+LLM_REQUESTS_PER_MINUTE = 0
+MATCH_LOG_FILENAME = "match_log.jsonl"
+MATCH_LOG_META_FILENAME = "match_log_meta.json"
+LLM_CACHE_FILENAME = "llm_assessments.json"
+LLM_CACHE_TTL = timedelta(days=7)
+
+
+@functools.lru_cache(maxsize=1)
+def _dotenv():
+    """Parse the repo's .env once per process."""
+    return dotenv_values(REPO_ROOT / ".env")
 
 
 class MatchEngine:
     """Two-stage matching: embedding cosine similarity then LLM validation."""
 
-    def __init__(self, market_store, signal_store, similarity_threshold=0.65):
+    def __init__(
+        self, market_store, signal_store, similarity_threshold=0.65, llm_requests_per_minute=None,
+    ):
         self.market_store = market_store
         self.signal_store = signal_store
         self.similarity_threshold = similarity_threshold
         self._embedding_index = EmbeddingIndex()
         self._api_key = self._load_api_key()
-        self._match_log_path = DEFAULT_CACHE_DIR / "match_log.json"
+        if llm_requests_per_minute is None:
+            llm_requests_per_minute = self._load_rate_limit()
+        self._rate_limiter = RateLimiter(llm_requests_per_minute) if llm_requests_per_minute > 0 else None
+        self._match_log_path = DEFAULT_CACHE_DIR / MATCH_LOG_FILENAME
+        self._match_log_meta_path = DEFAULT_CACHE_DIR / MATCH_LOG_META_FILENAME
+        self._llm_cache_path = DEFAULT_CACHE_DIR / LLM_CACHE_FILENAME
 
     def _load_api_key(self):
         key = os.environ.get("ANTHROPIC_API_KEY")
         if not key:
-            env_path = Path(__file__).resolve().parents[2] / ".env"
-            vals = dotenv_values(env_path)
-            key = vals.get("ANTHROPIC_API_KEY")
+            key = _dotenv().get("ANTHROPIC_API_KEY")
         if not key:
             logger.warning("ANTHROPIC_API_KEY not found — LLM assessment will be skipped")
         return key
 
+    @staticmethod
+    def _load_rate_limit():
+        value = os.environ.get("LLM_REQUESTS_PER_MINUTE") or _dotenv().get("LLM_REQUESTS_PER_MINUTE")
+        if not value:
+            return LLM_REQUESTS_PER_MINUTE
+        try:
+            return float(value)
+        except ValueError:
+            logger.warning("Ignoring invalid LLM_REQUESTS_PER_MINUTE=%r", value)
+            return LLM_REQUESTS_PER_MINUTE
+
     def run(self, headlines=None):
         """Run the full matching pipeline.
 
@@ -62,12 +96,15 @@ class MatchEngine:
         # Stage 1: build / load embedding index
         self._embedding_index.build_market_index(markets)
 
+        titles = [h.get("title", "") for h in headlines]
+        candidates_per_headline = self._embedding_index.find_matches_batch(
+            titles, threshold=self.similarity_threshold,
+        )
+
         results = []
         total_candidates = 0
 
-        for headline in headlines:
-            title = headline.get("title", "")
-            candidates = self._embedding_index.find_matches(title, threshold=self.similarity_threshold)
+        for headline, title, candidates in zip(headlines, titles, candidates_per_headline):
             total_candidates += len(candidates)
 
             for market, score in candidates:
@@ -91,17 +128,13 @@ class MatchEngine:
                     "matched_at": datetime.now(timezone.utc).isoformat(),
                 }
 
-                # Stage 2: LLM assessment
-                if self._api_key:
-                    assessment = assess_match(headline, market, self._api_key)
-                    result["llm_assessment"] = assessment
-                    logger.info(
-                        "MATCH CHAIN | headline=%r | market=%r | llm_response=%s",
-                        title, market_question, assessment,
-                    )
-
                 results.append(result)
 
+        # Stage 2: LLM assessment — pairs seen in earlier runs come from the
+        # cache; the rest are network-bound, so run those calls concurrently
+        if self._api_key and results:
+            self._assess(results)
+
         logger.info(
             "Matching complete: %d headlines, %d candidates, %d results",
             len(headlines), total_candidates, len(results),
@@ -110,14 +143,101 @@ class MatchEngine:
         self._save_log(results)
         return results
 
+    def _assess(self, results):
+        """Fill in ``llm_assessment`` on each result, using the assessment cache."""
+        cache = self._load_llm_cache()
+        # Entries past the TTL are misses; they're dropped on the next save
+        cutoff = (datetime.now(timezone.utc) - LLM_CACHE_TTL).isoformat()
+        pending = []
+        for result in results:
+            key = self._assessment_key(result["headline"], result["market"])
+            entry = cache.get(key)
+            if entry and entry.get("assessed_at", "") >= cutoff:
+                result["llm_assessment"] = entry["assessment"]
+                self._log_assessment(result, cached=True)
+            else:
+                pending.append((key, result))
+
+        if not pending:
+            return
+
+        def assess(item):
+            _, result = item
+            if self._rate_limiter is not None:
+                self._rate_limiter.wait()
+            return assess_match(result["headline"], result["market"], self._api_key)
+
+        with ThreadPoolExecutor(max_workers=LLM_WORKERS) as pool:
+            assessments = list(pool.map(assess, pending))
+
+        now_iso = datetime.now(timezone.utc).isoformat()
+        added = 0
+        for (key, result), assessment in zip(pending, assessments):
+            result["llm_assessment"] = assessment
+            self._log_assessment(result, cached=False)
+            if assessment is not None:
+                cache[key] = {"assessment": assessment, "assessed_at": now_iso}
+                added += 1
+
+        if added:
+            self._save_llm_cache(cache)
+
+    @staticmethod
+    def _log_assessment(result, cached):
+        logger.info(
+            "MATCH CHAIN | headline=%r | market=%r | llm_response=%s%s",
+            result["headline"].get("title", ""), result["market"].get("question", "?"),
+            result["llm_assessment"], " (cached)" if cached else "",
+        )
+
+    @staticmethod
+    def _assessment_key(headline, market):
+        hid = headline.get("id") or headline.get("title", "")
+        mid = market.get("id") or market.get("conditionId", "")
+        return hashlib.blake2b(f"{hid}|{mid}".encode(), digest_size=16).hexdigest()
+
+    def _load_llm_cache(self):
+        if not self._llm_cache_path.exists():
+            return {}
+        try:
+            return orjson.loads(self._llm_cache_path.read_bytes())
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable LLM cache %s: %s", self._llm_cache_path, e)
+            return {}
+
+    def _save_llm_cache(self, cache):
+        """Persist the assessment cache, dropping entries older than LLM_CACHE_TTL."""
+        cutoff = (datetime.now(timezone.utc) - LLM_CACHE_TTL).isoformat()
+        live = {k: v for k, v in cache.items() if v.get("assessed_at", "") >= cutoff}
+        self._llm_cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._llm_cache_path.write_bytes(orjson.dumps(live))
+
     def _save_log(self, results):
-        """Persist match results to disk."""
-        log_data = {
+        """Append this run's match results to the JSON-Lines match log.
+
+        Only the new results are serialised, so the cost of saving doesn't
+        grow with the log's history. Run bookkeeping goes to a small sidecar.
+        """
+        self._match_log_path.parent.mkdir(parents=True, exist_ok=True)
+        if results:
+            lines = b"".join(
+                orjson.dumps(r, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+                for r in results
+            )
+            with open(self._match_log_path, "ab") as f:
+                f.write(lines)
+
+        meta = {}
+        if self._match_log_meta_path.exists():
+            try:
+                meta = orjson.loads(self._match_log_meta_path.read_bytes())
+            except (OSError, ValueError):
+                meta = {}
+        meta = {
             "run_at": datetime.now(timezone.utc).isoformat(),
-            "count": len(results),
-            "matches": results,
+            "last_run_count": len(results),
+            "runs": meta.get("runs", 0) + 1,
+            "count": meta.get("count", 0) + len(results),
         }
-        self._match_log_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self._match_log_path, "w") as f:
-            json.dump(log_data, f, indent=2, default=str)
-        logger.info("Saved match log to %s", self._match_log_path)
+        self._match_log_meta_path.write_bytes(orjson.dumps(meta))
+        logger.info("Appended %d matches to %s", len(results), self._match_log_path)
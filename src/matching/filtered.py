@@ -0,0 +1,52 @@
+"""Confidence-filtered view of the match log, shared by dashboard and export."""
+
+import functools
+import os
+from pathlib import Path
+
+from src._paths import DATA_DIR
+from src.market._parsed_cache import load_parsed
+
+MATCH_LOG = DATA_DIR / "match_log.jsonl"
+CONFIDENCE_THRESHOLD = 0.6
+
+
+def _market_id(market):
+    return market.get("id") or market.get("conditionId", "")
+
+
+@functools.lru_cache(maxsize=4)
+def _filtered(path_str, mtime_ns, size, confidence_threshold):
+    """Parse the match log once per (file version, threshold).
+
+    Returns a tuple of (match, market_id, headline, llm, qualifies) where
+    ``qualifies`` means the LLM marked it relevant at or above the threshold.
+    """
+    matches = load_parsed(Path(path_str))
+    get_id = _market_id
+    rows = []
+    for m in matches:
+        llm = m.get("llm_assessment") or {}
+        mid = get_id(m.get("market") or {})
+        headline = (m.get("headline") or {}).get("title", "")
+        qualifies = bool(llm.get("relevant")) and (llm.get("confidence") or 0) >= confidence_threshold
+        rows.append((m, mid, headline, llm, qualifies))
+    return tuple(rows)
+
+
+def filter_matches(trade_keys, path=MATCH_LOG, confidence_threshold=CONFIDENCE_THRESHOLD):
+    """Return every logged match as (match, market_id, headline, llm, became_trade) tuples.
+
+    ``became_trade`` is True when the match cleared the confidence filter and
+    its (market_id, headline) pair is in ``trade_keys``. The parsed and
+    filtered log is memoised on the file's mtime and size.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return []
+    base = _filtered(str(path), st.st_mtime_ns, st.st_size, confidence_threshold)
+    return [
+        (m, mid, headline, llm, qualifies and (mid, headline) in trade_keys)
+        for m, mid, headline, llm, qualifies in base
+    ]
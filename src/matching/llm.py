@@ -1,17 +1,25 @@
 """Claude Haiku assessment for headline–market match candidates."""
 
-import json
+import atexit
+import functools
 import logging
+import queue
 import re
-from pathlib import Path
+import threading
+import time
 
-import anthropic
+import orjson
+
+from src._paths import DATA_DIR
 
 logger = logging.getLogger(__name__)
 
-DEBUG_LOG_PATH = Path(__file__).resolve().parents[2] / "data" / "llm_debug.log"
+DEBUG_LOG_PATH = DATA_DIR / "llm_debug.log"
 
 MODEL = "claude-haiku-4-5-20251001"
+MAX_TOKENS = 160
+# Descriptions run to several KB; the relevance signal is mostly in the question
+MAX_DESCRIPTION_CHARS = 400
 
 SYSTEM_PROMPT = (
     "You are an analyst evaluating whether a news headline is relevant to a "
@@ -32,17 +40,48 @@ USER_PROMPT_TEMPLATE = (
 )
 
 
+class RateLimiter:
+    """Thread-safe limiter that spaces calls to at most ``per_minute`` a minute."""
+
+    def __init__(self, per_minute):
+        self._interval = 60.0 / per_minute
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """Block until the caller's reserved slot comes up."""
+        with self._lock:
+            slot = max(time.monotonic(), self._next_slot)
+            self._next_slot = slot + self._interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+@functools.lru_cache(maxsize=4)
+def _client(api_key):
+    """Shared Anthropic client per key, so calls reuse one HTTP connection pool.
+
+    Extra retries give concurrent assessments room to ride out 429s, since
+    by default nothing paces them client-side.
+    """
+    import anthropic
+
+    return anthropic.Anthropic(api_key=api_key, max_retries=4, timeout=30.0)
+
+
 def _extract_prices(market):
     """Extract YES/NO prices from market data."""
-    outcomes = market.get("outcomes", [])
-    prices = market.get("outcomePrices", [])
-    yes_price, no_price = "N/A", "N/A"
-    for outcome, price in zip(outcomes, prices):
-        if str(outcome).upper() == "YES":
-            yes_price = price
-        elif str(outcome).upper() == "NO":
-            no_price = price
-    return yes_price, no_price
+    lookup = {
+        str(o).upper(): p
+        for o, p in zip(market.get("outcomes", []), market.get("outcomePrices", []))
+    }
+    return lookup.get("YES", "N/A"), lookup.get("NO", "N/A")
+
+
+_FENCE_START = re.compile(r"^```(?:json)?\s*\n?", re.IGNORECASE)
+_FENCE_END = re.compile(r"\n?```\s*$")
+_JSON_OBJ = re.compile(r"\{.*\}", re.DOTALL)
 
 
 def _parse_json_response(text):
@@ -51,39 +90,84 @@ def _parse_json_response(text):
     if isinstance(text, dict):
         return text
 
+    # Fast path: the prompt asks for raw JSON, which is what we usually get
+    if text.startswith("{") and text.endswith("}"):
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+
     # Strip markdown code fences: ```json ... ``` or ``` ... ```
-    stripped = re.sub(r"^```(?:json)?\s*\n?", "", text, flags=re.IGNORECASE)
-    stripped = re.sub(r"\n?```\s*$", "", stripped)
+    stripped = _FENCE_START.sub("", text)
+    stripped = _FENCE_END.sub("", stripped)
     stripped = stripped.strip()
 
     try:
-        return json.loads(stripped)
-    except json.JSONDecodeError:
+        return orjson.loads(stripped)
+    except orjson.JSONDecodeError:
         pass
 
     # Last resort: find the first { ... } block
-    match = re.search(r"\{.*\}", stripped, re.DOTALL)
+    match = _JSON_OBJ.search(stripped)
     if match:
         try:
-            return json.loads(match.group())
-        except json.JSONDecodeError:
+            return orjson.loads(match.group())
+        except orjson.JSONDecodeError:
             pass
 
     logger.warning("Could not parse LLM response as JSON: %s", text[:200])
     return None
 
 
-def _log_debug(headline, market_question, raw_response):
-    """Append raw LLM response to a debug log file."""
+_debug_queue = None
+_debug_queue_lock = threading.Lock()
+
+
+def _debug_writer(q):
+    """Drain queued debug entries into one long-lived, buffered handle."""
     try:
         DEBUG_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(DEBUG_LOG_PATH, "a") as f:
-            f.write(f"headline: {headline}\n")
-            f.write(f"market:   {market_question}\n")
-            f.write(f"response: {raw_response}\n")
-            f.write("-" * 60 + "\n")
+        f = open(DEBUG_LOG_PATH, "a", buffering=1 << 16)
     except OSError:
-        pass
+        f = None
+    while True:
+        entry = q.get()
+        if f is not None:
+            try:
+                f.write(entry)
+                if q.empty():
+                    f.flush()
+            except OSError:
+                pass
+        q.task_done()
+
+
+def _flush_debug_log():
+    """Block until queued debug entries have been written (registered atexit)."""
+    if _debug_queue is not None:
+        _debug_queue.join()
+
+
+def _get_debug_queue():
+    global _debug_queue
+    if _debug_queue is None:
+        with _debug_queue_lock:
+            if _debug_queue is None:
+                q = queue.Queue()
+                threading.Thread(target=_debug_writer, args=(q,), name="llm-debug-log", daemon=True).start()
+                atexit.register(_flush_debug_log)
+                _debug_queue = q
+    return _debug_queue
+
+
+def _log_debug(headline, market_question, raw_response):
+    """Queue the raw LLM response for the background debug-log writer."""
+    _get_debug_queue().put_nowait(
+        f"headline: {headline}\n"
+        f"market:   {market_question}\n"
+        f"response: {raw_response}\n"
+        + "-" * 60 + "\n"
+    )
 
 
 def assess_match(headline, market, api_key):
@@ -97,20 +181,22 @@ def assess_match(headline, market, api_key):
     Returns:
         Parsed dict with {relevant, direction, confidence, reasoning}, or None on failure.
     """
+    import anthropic  # deferred: only needed once a match is actually assessed
+
     yes_price, no_price = _extract_prices(market)
     prompt = USER_PROMPT_TEMPLATE.format(
         headline=headline["title"],
         market_title=market.get("question", ""),
-        market_description=market.get("description", ""),
+        market_description=(market.get("description") or "")[:MAX_DESCRIPTION_CHARS],
         yes_price=yes_price,
         no_price=no_price,
     )
 
     try:
-        client = anthropic.Anthropic(api_key=api_key)
+        client = _client(api_key)
         response = client.messages.create(
             model=MODEL,
-            max_tokens=256,
+            max_tokens=MAX_TOKENS,
             system=SYSTEM_PROMPT,
             messages=[{"role": "user", "content": prompt}],
         )
@@ -1 +1,11 @@
-from .trader import PaperTrader
+__all__ = ["PaperTrader"]
+
+
+def __getattr__(name):
+    # Resolved on first access so `python -m src.paper_trading.log` / `.check`
+    # don't import the whole trading stack just to load the package.
+    if name == "PaperTrader":
+        from .trader import PaperTrader
+
+        return PaperTrader
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,6 +6,7 @@ Usage:
 
 import logging
 import sys
+from collections import Counter
 from datetime import timedelta
 
 from src.market import MarketStore
@@ -16,10 +17,9 @@ from .trader import PaperTrader
 
 def _fmt_duration(td):
     """Format a timedelta into a human-readable string."""
-    total_seconds = int(td.total_seconds())
-    days = total_seconds // 86400
-    hours = (total_seconds % 86400) // 3600
-    minutes = (total_seconds % 3600) // 60
+    days, rem = divmod(int(td.total_seconds()), 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes = rem // 60
     if days > 0:
         return f"{days}d {hours}h {minutes}m"
     if hours > 0:
@@ -75,10 +75,7 @@ def main():
     print(f"  Avg time held:  {_fmt_duration(avg_held_td)}")
 
     if closed_results:
-        reasons = {}
-        for r in closed_results:
-            reason = r["trade"].get("exit_reason", "unknown")
-            reasons[reason] = reasons.get(reason, 0) + 1
+        reasons = Counter(r["trade"].get("exit_reason", "unknown") for r in closed_results)
         reason_str = ", ".join(f"{v} {k}" for k, v in sorted(reasons.items()))
         print(f"  Exit reasons:   {reason_str}")
     print()
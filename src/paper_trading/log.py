@@ -7,13 +7,12 @@ Usage:
 import logging
 import sys
 
-from src.market import MarketStore
-from src.signals import SignalStore
-from src.matching import MatchEngine
-from .trader import PaperTrader
-
 
 def main():
+    if any(arg in ("-h", "--help") for arg in sys.argv[1:]):
+        print(__doc__.strip())
+        return
+
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s %(name)s %(levelname)s  %(message)s",
@@ -24,6 +23,12 @@ def main():
     print("Phase 4 — Paper Trading: Log Trades")
     print("=" * 60)
 
+    # Imported after the banner: these pull in numpy, requests, feedparser, etc.
+    from src.market import MarketStore
+    from src.signals import SignalStore
+    from src.matching import MatchEngine
+    from .trader import PaperTrader
+
     # Load cached data
     market_store = MarketStore()
     market_store.load()
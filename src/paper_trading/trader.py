@@ -1,18 +1,32 @@
 """Paper trading engine — logs simulated trades and evaluates P&L."""
 
-import json
+import bisect
 import logging
-import uuid
+import math
+import os
+import secrets
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import ciso8601
+import numpy as np
+import orjson
+
+from src._paths import DATA_DIR
 from src.market import ClobClient, MarketStore
 from src.matching import MatchEngine
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_DATA_DIR = Path(__file__).resolve().parents[2] / "data"
-TRADES_FILENAME = "paper_trades.json"
+DEFAULT_DATA_DIR = DATA_DIR
+TRADES_FILENAME = "paper_trades.jsonl"
+TRADES_META_FILENAME = "paper_trades_meta.json"
+LEGACY_TRADES_FILENAME = "paper_trades.json"  # pre-JSONL store, migrated on first load
+# Compact the trade log once superseded records exceed this share of live ones
+COMPACT_MIN_RECORDS = 200
+COMPACT_STALE_RATIO = 0.5
+WRITE_BUFFER_SIZE = 1 << 16
+_RECORD_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
 POSITION_SIZE_USD = 25.0
 CONFIDENCE_THRESHOLD = 0.6
 LIQUIDITY_SPREAD_LIMIT = 0.05   # only fill asks within 5% of midpoint
@@ -25,41 +39,160 @@ MAX_HOLD_TIME = timedelta(hours=2)
 class PaperTrader:
     """Logs and evaluates paper trades based on match engine signals."""
 
-    def __init__(self, market_store, match_engine, data_dir=None):
+    def __init__(self, market_store, match_engine, data_dir=None, durability=False):
         self.market_store = market_store
         self.match_engine = match_engine
         self.clob = ClobClient()
         self.data_dir = Path(data_dir) if data_dir else DEFAULT_DATA_DIR
         self.trades_path = self.data_dir / TRADES_FILENAME
+        self.meta_path = self.data_dir / TRADES_META_FILENAME
+        self.legacy_trades_path = self.data_dir / LEGACY_TRADES_FILENAME
+        self.durability = durability  # fsync trade log writes before returning
         self._trades = []
+        self._trades_by_id = {}
         self._skipped = []
+        self._log_records = 0  # lines in the trade log, live or superseded
+        self._loaded_key = None  # (mtime_ns, size) of the trade log the in-memory trades reflect
+        self._outcome_indexes = {}  # id(market) -> (market, {OUTCOME: position}), per log_trades pass
 
     # ── Persistence ──────────────────────────────────────────────────
 
     def load_trades(self):
-        """Load existing paper trades from disk."""
-        if not self.trades_path.exists():
-            self._trades = []
-            self._skipped = []
+        """Load existing paper trades from disk.
+
+        The trade log is JSON Lines of ``{"type": "trade"|"skip", "data": ...}``
+        records. A trade is re-appended whenever it changes, so the last
+        record for each trade_id wins. A no-op if the log hasn't changed
+        since it was last loaded or written by this trader.
+        """
+        try:
+            st = os.stat(self.trades_path)
+        except FileNotFoundError:
+            st = None
+        if st is not None and (st.st_mtime_ns, st.st_size) == self._loaded_key:
+            return self._trades
+
+        self._trades = []
+        self._trades_by_id = {}
+        self._skipped = []
+        self._log_records = 0
+        self._loaded_key = None
+
+        if st is None:
+            if self.legacy_trades_path.exists():
+                self._migrate_legacy()
             return self._trades
-        with open(self.trades_path, "r") as f:
-            data = json.load(f)
+
+        by_id = {}
+        skipped = self._skipped
+        loads = orjson.loads
+        lines = self.trades_path.read_bytes().splitlines()
+        torn = False
+        for n, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = loads(line)
+            except orjson.JSONDecodeError:
+                if n == len(lines):
+                    # Torn final append from an interrupted write
+                    logger.warning("Dropping truncated last record in %s", self.trades_path)
+                    torn = True
+                    continue
+                raise
+            self._log_records += 1
+            if record["type"] == "trade":
+                by_id[record["data"]["trade_id"]] = record["data"]
+            else:
+                skipped.append(record["data"])
+        self._trades = list(by_id.values())
+        self._trades_by_id = by_id
+        self._loaded_key = (st.st_mtime_ns, st.st_size)
+        if torn:
+            # Rewrite so the next append doesn't land on the partial line
+            self._save_trades()
+        return self._trades
+
+    def get_trade(self, trade_id):
+        """Return the loaded trade with ``trade_id``, or None."""
+        return self._trades_by_id.get(trade_id)
+
+    def _migrate_legacy(self):
+        """Convert the old single-document paper_trades.json into the trade log."""
+        data = orjson.loads(self.legacy_trades_path.read_bytes())
         self._trades = data.get("trades", [])
+        self._trades_by_id = {t["trade_id"]: t for t in self._trades}
         self._skipped = data.get("skipped_trades", [])
-        return self._trades
+        self._save_trades()
+        logger.info(
+            "Migrated %d trades from %s to %s",
+            len(self._trades), self.legacy_trades_path, self.trades_path,
+        )
+
+    @staticmethod
+    def _record_lines(trades, skipped):
+        dumps = orjson.dumps
+        lines = [dumps({"type": "trade", "data": t}, default=str, option=_RECORD_OPTS) for t in trades]
+        lines.extend(dumps({"type": "skip", "data": s}, default=str, option=_RECORD_OPTS) for s in skipped)
+        return lines
+
+    def _append_records(self, trades=(), skipped=()):
+        """Append new or changed trades and new skips to the trade log.
+
+        Compacts the log instead once superseded trade records make up more
+        than COMPACT_STALE_RATIO of the live ones.
+        """
+        lines = self._record_lines(trades, skipped)
+        if not lines:
+            return
+        live = len(self._trades) + len(self._skipped)
+        stale = self._log_records + len(lines) - live
+        if self._log_records + len(lines) >= COMPACT_MIN_RECORDS and stale > live * COMPACT_STALE_RATIO:
+            self._save_trades()
+            return
+
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.trades_path, "ab", buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(b"".join(lines))
+            self._sync(f)
+        self._log_records += len(lines)
+        self._mark_loaded()
+        self._save_meta()
 
     def _save_trades(self):
-        """Persist paper trades and skipped entries to disk."""
+        """Rewrite the trade log with one record per live trade and skip."""
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        payload = {
+        lines = self._record_lines(self._trades, self._skipped)
+        self._write_atomic(self.trades_path, b"".join(lines))
+        self._log_records = len(lines)
+        self._mark_loaded()
+        self._save_meta()
+
+    def _mark_loaded(self):
+        """Record that the in-memory trades match the log as just written."""
+        st = os.stat(self.trades_path)
+        self._loaded_key = (st.st_mtime_ns, st.st_size)
+
+    def _save_meta(self):
+        meta = {
             "updated_at": datetime.now(timezone.utc).isoformat(),
             "count": len(self._trades),
-            "trades": self._trades,
             "skipped_count": len(self._skipped),
-            "skipped_trades": self._skipped,
         }
-        with open(self.trades_path, "w") as f:
-            json.dump(payload, f, indent=2, default=str)
+        self._write_atomic(self.meta_path, orjson.dumps(meta))
+
+    def _write_atomic(self, path, data):
+        """Write ``data`` to a temp file and swap it in, so readers never see a partial file."""
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(data)
+            self._sync(f)
+        os.replace(tmp, path)
+
+    def _sync(self, f):
+        if self.durability:
+            f.flush()
+            os.fsync(f.fileno())
 
     # ── Log trades ───────────────────────────────────────────────────
 
@@ -72,41 +205,64 @@ class PaperTrader:
         self.load_trades()
         results = self.match_engine.run()
 
-        existing_keys = {(t["market_id"], t["headline"]) for t in self._trades}
-        skipped_keys = {(s["market_id"], s["headline"]) for s in self._skipped}
-
-        new_trades = []
-        new_skipped = []
-        for result in results:
-            llm = result.get("llm_assessment")
-            if not llm or not llm.get("relevant"):
-                continue
-            if (llm.get("confidence") or 0) < CONFIDENCE_THRESHOLD:
-                continue
-
+        # Fingerprints of (market_id, headline) pairs already traded or skipped
+        fingerprint = self._fingerprint
+        seen = {fingerprint(t["market_id"], t["headline"]) for t in self._trades}
+        seen.update(fingerprint(s["market_id"], s["headline"]) for s in self._skipped)
+
+        # Pass 1: pick out qualifying, not-yet-seen signals
+        self._outcome_indexes = {}
+        qualifying = [
+            (result, llm) for result in results
+            if (llm := result.get("llm_assessment"))
+            and llm.get("relevant")
+            and (llm.get("confidence") or 0) >= CONFIDENCE_THRESHOLD
+        ]
+        candidates = []
+        for result, llm in qualifying:
             market = result["market"]
             headline = result["headline"]["title"]
             direction = llm["direction"]
             market_id = market.get("id", market.get("conditionId", "unknown"))
 
-            if (market_id, headline) in existing_keys or (market_id, headline) in skipped_keys:
+            fp = fingerprint(market_id, headline)
+            if fp in seen:
+                continue
+
+            direction_key = str(direction).upper()
+            token_id = self._get_token_id(market, direction_key)
+            candidates.append((result, llm, market, headline, direction, market_id, token_id, fp))
+
+        # Pass 2: one batched order-book and midpoint request for every candidate
+        token_ids = [c[6] for c in candidates if c[6]]
+        books = self._fetch_order_books(token_ids)
+        mids = self._fetch_midpoints(token_ids)
+
+        new_trades = []
+        new_skipped = []
+        # One timestamp for the whole batch
+        now_iso = datetime.now(timezone.utc).isoformat()
+        for result, llm, market, headline, direction, market_id, token_id, fp in candidates:
+            # The same (market, headline) pair may appear twice in one run
+            if fp in seen:
                 continue
 
             # Entry price via VWAP from order book
-            token_id = self._get_token_id(market, direction)
-            entry_price, skip_reason = self._compute_entry_price(token_id)
+            entry_price, skip_reason = self._compute_entry_price(
+                token_id, books.get(token_id), mids.get(token_id, 0),
+            )
 
             # Fallback to cached outcomePrices (only if order book was unavailable,
             # NOT if liquidity was insufficient — that's a real skip)
             if entry_price is None and skip_reason != "insufficient_liquidity":
-                fallback = self._get_outcome_price(market, direction)
+                fallback = self._get_outcome_price(market, str(direction).upper())
                 if fallback and fallback > 0:
                     entry_price = fallback
                     skip_reason = None
 
             if skip_reason == "insufficient_liquidity":
                 skip_entry = {
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "timestamp": now_iso,
                     "market_id": market_id,
                     "market_title": market.get("question", ""),
                     "headline": headline,
@@ -117,7 +273,7 @@ class PaperTrader:
                 }
                 new_skipped.append(skip_entry)
                 self._skipped.append(skip_entry)
-                skipped_keys.add((market_id, headline))
+                seen.add(fp)
                 logger.info("Skipped — insufficient liquidity: %s", market.get("question", ""))
                 continue
 
@@ -126,8 +282,8 @@ class PaperTrader:
                 continue
 
             trade = {
-                "trade_id": str(uuid.uuid4())[:8],
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "trade_id": self._new_trade_id(),
+                "timestamp": now_iso,
                 "market_id": market_id,
                 "market_title": market.get("question", ""),
                 "headline": headline,
@@ -144,10 +300,11 @@ class PaperTrader:
 
             new_trades.append(trade)
             self._trades.append(trade)
-            existing_keys.add((market_id, headline))
+            self._trades_by_id[trade["trade_id"]] = trade
+            seen.add(fp)
 
-        if new_trades or new_skipped:
-            self._save_trades()
+        self._outcome_indexes = {}
+        self._append_records(new_trades, new_skipped)
 
         return new_trades, new_skipped
 
@@ -163,178 +320,244 @@ class PaperTrader:
         self.load_trades()
         self.market_store.load()
 
-        market_lookup = {}
-        for m in self.market_store.markets:
-            mid = m.get("id", m.get("conditionId"))
-            if mid:
-                market_lookup[mid] = m
-
-        results = []
-        changed = False
-        now = datetime.now(timezone.utc)
+        market_lookup = self.market_store.by_id()
 
+        # Price open trades from cached market data where possible; anything
+        # left over is priced from one batched CLOB midpoint request.
+        # Per-market {OUTCOME: price}, built once for each market with an open trade
+        direction_prices = {}
+        cached_prices = {}
+        missing_tokens = []
         for trade in self._trades:
-            # Already closed — return stored exit data
             if trade.get("status") == "closed":
-                results.append({
-                    "trade": trade,
-                    "current_price": trade.get("exit_price", trade["entry_price"]),
-                    "pnl_usd": trade.get("final_pnl_usd", 0),
-                    "pnl_pct": trade.get("final_pnl_pct", 0),
-                    "time_held": timedelta(seconds=trade.get("hold_duration_seconds", 0)),
-                })
                 continue
+            mid = trade["market_id"]
+            prices = direction_prices.get(mid)
+            if prices is None:
+                market = market_lookup.get(mid)
+                prices = direction_prices[mid] = self._direction_prices(market) if market else {}
+            price = prices.get(trade["direction"].upper())
+            cached_prices[trade["trade_id"]] = price
+            if price is None and trade.get("token_id"):
+                missing_tokens.append(trade["token_id"])
+        clob_mids = self._fetch_midpoints(missing_tokens)
+
+        now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
 
-            # Open trade — fetch current price
-            current_price = None
-            market = market_lookup.get(trade["market_id"])
-            if market:
-                current_price = self._get_outcome_price(market, trade["direction"])
+        # Open trades — current price from market cache or CLOB midpoint
+        open_trades = [t for t in self._trades if t.get("status") != "closed"]
+        current = []
+        for trade in open_trades:
+            current_price = cached_prices.get(trade["trade_id"])
             if current_price is None and trade.get("token_id"):
-                try:
-                    mid_data = self.clob.get_midpoint(trade["token_id"])
-                    current_price = float(mid_data.get("mid", 0))
-                except Exception:
-                    pass
+                current_price = clob_mids.get(trade["token_id"])
             if current_price is None or current_price <= 0:
                 current_price = trade["entry_price"]  # can't price — assume flat
+            current.append(current_price)
+        held = [now - ciso8601.parse_datetime(t["timestamp"]) for t in open_trades]
+
+        # P&L and exit conditions for every open trade in one vector pass
+        cur = np.array(current, dtype=float)
+        entry = np.array([t["entry_price"] for t in open_trades], dtype=float)
+        shares = np.array([t["shares"] for t in open_trades], dtype=float)
+        held_s = np.array([h.total_seconds() for h in held], dtype=float)
+        pnl_usd = (cur - entry) * shares
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pnl_pct = np.where(entry > 0, (cur - entry) / entry * 100, 0.0)
+
+        # ── Exit conditions (checked in priority order) ──────
+        stop = pnl_pct <= -STOP_LOSS_PCT
+        take = ~stop & (pnl_pct >= TAKE_PROFIT_PCT) & (held_s >= MIN_HOLD_FOR_TP.total_seconds())
+        expire = ~stop & ~take & (held_s >= MAX_HOLD_TIME.total_seconds())
+        exit_reasons = np.select([stop, take, expire], ["stop_loss", "take_profit", "time_expired"], "")
+
+        cur_r = np.round(cur, 4).tolist()
+        pnl_usd_r = np.round(pnl_usd, 2).tolist()
+        pnl_pct_r = np.round(pnl_pct, 2).tolist()
+
+        closed = []
+        for i in np.flatnonzero(stop | take | expire).tolist():
+            trade = open_trades[i]
+            trade["status"] = "closed"
+            trade["exit_price"] = cur_r[i]
+            trade["exit_timestamp"] = now_iso
+            trade["exit_reason"] = str(exit_reasons[i])
+            trade["final_pnl_usd"] = pnl_usd_r[i]
+            trade["final_pnl_pct"] = pnl_pct_r[i]
+            trade["hold_duration_seconds"] = int(held_s[i])
+            closed.append(trade)
+            logger.info(
+                "Closed trade %s — %s (P&L: $%.2f / %.2f%%)",
+                trade["trade_id"], trade["exit_reason"], pnl_usd[i], pnl_pct[i],
+            )
 
-            entry = trade["entry_price"]
-            shares = trade["shares"]
-            pnl_usd = (current_price - entry) * shares
-            pnl_pct = ((current_price - entry) / entry) * 100 if entry > 0 else 0
-
-            trade_time = datetime.fromisoformat(trade["timestamp"])
-            held = now - trade_time
-
-            # ── Exit conditions (checked in priority order) ──────
-            exit_reason = None
-            if pnl_pct <= -STOP_LOSS_PCT:
-                exit_reason = "stop_loss"
-            elif pnl_pct >= TAKE_PROFIT_PCT and held >= MIN_HOLD_FOR_TP:
-                exit_reason = "take_profit"
-            elif held >= MAX_HOLD_TIME:
-                exit_reason = "time_expired"
-
-            if exit_reason:
-                trade["status"] = "closed"
-                trade["exit_price"] = round(current_price, 4)
-                trade["exit_timestamp"] = now.isoformat()
-                trade["exit_reason"] = exit_reason
-                trade["final_pnl_usd"] = round(pnl_usd, 2)
-                trade["final_pnl_pct"] = round(pnl_pct, 2)
-                trade["hold_duration_seconds"] = int(held.total_seconds())
-                changed = True
-                logger.info(
-                    "Closed trade %s — %s (P&L: $%.2f / %.2f%%)",
-                    trade["trade_id"], exit_reason, pnl_usd, pnl_pct,
-                )
+        results = []
+        open_index = {id(t): i for i, t in enumerate(open_trades)}
+        for trade in self._trades:
+            i = open_index.get(id(trade))
+            if i is not None:
+                results.append({
+                    "trade": trade,
+                    "current_price": cur_r[i],
+                    "pnl_usd": pnl_usd_r[i],
+                    "pnl_pct": pnl_pct_r[i],
+                    "time_held": held[i],
+                })
+                continue
 
+            # Already closed — return stored exit data
             results.append({
                 "trade": trade,
-                "current_price": round(current_price, 4),
-                "pnl_usd": round(pnl_usd, 2),
-                "pnl_pct": round(pnl_pct, 2),
-                "time_held": held,
+                "current_price": trade.get("exit_price", trade["entry_price"]),
+                "pnl_usd": trade.get("final_pnl_usd", 0),
+                "pnl_pct": trade.get("final_pnl_pct", 0),
+                "time_held": timedelta(seconds=trade.get("hold_duration_seconds", 0)),
             })
 
-        if changed:
-            self._save_trades()
+        self._append_records(closed)
 
         return results
 
     # ── Internal helpers ─────────────────────────────────────────────
 
-    def _get_token_id(self, market, direction):
-        """Get the CLOB token ID for the given direction (YES/NO)."""
-        outcomes = market.get("outcomes", [])
+    @staticmethod
+    def _fingerprint(market_id, headline):
+        """Process-local int fingerprint of a (market_id, headline) pair for dedup."""
+        return hash((market_id, headline))
+
+    def _new_trade_id(self):
+        """Random 8-hex-char id, unique among loaded trades."""
+        while True:
+            trade_id = secrets.token_hex(4)
+            if trade_id not in self._trades_by_id:
+                return trade_id
+
+    def _outcome_index(self, market):
+        """{UPPER_OUTCOME: position} for ``market``, built once per log_trades pass.
+
+        Kept beside the market (keyed by id, holding a reference so the id
+        can't be reused) rather than stored on the shared market dict.
+        """
+        entry = self._outcome_indexes.get(id(market))
+        if entry is not None and entry[0] is market:
+            return entry[1]
+        index = {}
+        for i, outcome in enumerate(market.get("outcomes", [])):
+            index.setdefault(str(outcome).upper(), i)
+        self._outcome_indexes[id(market)] = (market, index)
+        return index
+
+    def _get_token_id(self, market, direction_key):
+        """Get the CLOB token ID for an upper-cased direction (YES/NO)."""
+        i = self._outcome_index(market).get(direction_key)
         token_ids = market.get("clobTokenIds", [])
-        for i, outcome in enumerate(outcomes):
-            if str(outcome).upper() == direction.upper() and i < len(token_ids):
-                return token_ids[i]
-        return None
+        if i is None or i >= len(token_ids):
+            return None
+        return token_ids[i]
+
+    def _fetch_midpoints(self, token_ids):
+        """Batch-fetch CLOB midpoints. Returns {token_id: float}; {} on failure."""
+        if not token_ids:
+            return {}
+        try:
+            data = self.clob.get_midpoints(list(dict.fromkeys(token_ids)))
+        except Exception as e:
+            logger.warning("Failed to fetch midpoints for %d tokens: %s", len(token_ids), e)
+            return {}
+
+        mids = {}
+        for tid, mid in data.items():
+            try:
+                mids[tid] = float(mid)
+            except (ValueError, TypeError):
+                pass
+        return mids
+
+    def _fetch_order_books(self, token_ids):
+        """Batch-fetch CLOB order books. Returns {token_id: book}; {} on failure."""
+        if not token_ids:
+            return {}
+        try:
+            data = self.clob.get_order_books(list(dict.fromkeys(token_ids)))
+        except Exception as e:
+            logger.warning("Failed to fetch order books for %d tokens: %s", len(token_ids), e)
+            return {}
+        return {book.get("asset_id"): book for book in data if isinstance(book, dict)}
 
-    def _compute_entry_price(self, token_id):
+    def _compute_entry_price(self, token_id, book, midpoint):
         """Compute VWAP for a $25 order, only filling asks within 5% of midpoint.
 
+        ``book`` and ``midpoint`` come from the batched CLOB fetch; ``book`` is
+        None if it couldn't be fetched and ``midpoint`` <= 0 if unknown.
+
         Returns:
             (vwap, None) on success, or (None, reason_string) on failure.
         """
         if not token_id:
             return None, "no_token_id"
 
-        try:
-            book = self.clob.get_order_book(token_id)
-        except Exception as e:
-            logger.warning("Failed to fetch order book for %s: %s", token_id, e)
+        if book is None:
             return None, "order_book_error"
 
         asks = book.get("asks", [])
         if not asks:
             return None, "no_asks"
 
-        # Determine midpoint for liquidity band
-        try:
-            mid_data = self.clob.get_midpoint(token_id)
-            midpoint = float(mid_data.get("mid", 0))
-        except Exception:
-            midpoint = 0
+        # One float conversion per level; tuples sort by price first
+        levels = sorted((float(a["price"]), float(a["size"])) for a in asks)
 
         if midpoint <= 0:
             bids = book.get("bids", [])
-            if bids and asks:
-                best_ask = min(float(a["price"]) for a in asks)
+            best_ask = levels[0][0]
+            if bids:
                 best_bid = max(float(b["price"]) for b in bids)
                 midpoint = (best_ask + best_bid) / 2
-            elif asks:
-                midpoint = float(min(asks, key=lambda a: float(a["price"]))["price"])
             else:
-                return None, "no_midpoint"
+                midpoint = best_ask
 
         max_price = midpoint * (1 + LIQUIDITY_SPREAD_LIMIT)
-        asks = sorted(asks, key=lambda a: float(a["price"]))
-
-        total_cost = 0.0
-        total_shares = 0.0
-        remaining = POSITION_SIZE_USD
-
-        for ask in asks:
-            price = float(ask["price"])
-            size = float(ask["size"])
-            if price <= 0:
-                continue
-            if price > max_price:
-                break  # outside 5% band
-
-            cost_at_level = price * size
-            if cost_at_level <= remaining:
-                total_cost += cost_at_level
-                total_shares += size
-                remaining -= cost_at_level
-            else:
-                shares_at_level = remaining / price
-                total_cost += remaining
-                total_shares += shares_at_level
-                remaining = 0
-                break
 
-        if total_shares == 0:
+        # VWAP walk as a prefix sum: levels are sorted, so the band (positive
+        # prices up to max_price) is a contiguous slice — cut it before
+        # converting, so out-of-band depth never reaches numpy
+        lo = bisect.bisect_right(levels, (0.0, math.inf))
+        hi = bisect.bisect_right(levels, (max_price, math.inf), lo)
+        if lo == hi:
             return None, "insufficient_liquidity"
+        band = np.array(levels[lo:hi], dtype=float)
+        prices, sizes = band[:, 0], band[:, 1]
+        cum_cost = np.cumsum(prices * sizes)
 
-        if remaining > 0:
+        # First level at which the cumulative cost reaches $25 is filled partially
+        k = int(np.searchsorted(cum_cost, POSITION_SIZE_USD))
+        if k == len(cum_cost):
             # Could not fill the full $25 within the liquidity band
             return None, "insufficient_liquidity"
 
-        return total_cost / total_shares, None
-
-    def _get_outcome_price(self, market, direction):
-        """Get the price for a direction from the market's outcomePrices."""
-        outcomes = market.get("outcomes", [])
+        filled_cost = float(cum_cost[k - 1]) if k else 0.0
+        total_shares = float(sizes[:k].sum()) + (POSITION_SIZE_USD - filled_cost) / float(prices[k])
+        return POSITION_SIZE_USD / total_shares, None
+
+    @staticmethod
+    def _direction_prices(market):
+        """Map each upper-cased outcome to its float price (None if unparseable)."""
+        prices = {}
+        for outcome, price in zip(market.get("outcomes", []), market.get("outcomePrices", [])):
+            try:
+                value = float(price)
+            except (ValueError, TypeError):
+                value = None
+            prices.setdefault(str(outcome).upper(), value)
+        return prices
+
+    def _get_outcome_price(self, market, direction_key):
+        """Get the price for an upper-cased direction from the market's outcomePrices."""
+        i = self._outcome_index(market).get(direction_key)
         prices = market.get("outcomePrices", [])
-        for outcome, price in zip(outcomes, prices):
-            if str(outcome).upper() == direction.upper():
-                try:
-                    return float(price)
-                except (ValueError, TypeError):
-                    return None
-        return None
+        if i is None or i >= len(prices):
+            return None
+        try:
+            return float(prices[i])
+        except (ValueError, TypeError):
+            return None
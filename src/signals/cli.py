@@ -31,6 +31,7 @@ def main():
         print(f"\nLoaded {store.count} cached headlines")
     else:
         new_count = store.refresh()
+        store.flush()  # surface a failed cache write before reporting success
         print(f"\nFetched {new_count} new headlines ({store.count} total)")
 
     print()
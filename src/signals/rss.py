@@ -1,13 +1,93 @@
+import html
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
 
 import feedparser
 
+try:
+    from lxml import etree
+except ImportError:  # optional — feeds are parsed by feedparser without it
+    etree = None
+
 from .base import SignalSource
 
 logger = logging.getLogger(__name__)
 
+MAX_FEED_WORKERS = 16
+FEED_TIMEOUT = 15
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+# Dropped with their content when reducing titles / summaries to text
+_SKIP_TAGS = frozenset({"script", "style"})
+# Separate the text on either side of them
+_BREAK_TAGS = frozenset({
+    "br", "p", "div", "li", "tr", "td", "blockquote", "h1", "h2", "h3", "h4", "h5", "h6",
+})
+
+if etree is not None:
+    from src.market._http import make_session
+
+    _SESSION = make_session(pool_size=MAX_FEED_WORKERS)
+    _SESSION.headers["User-Agent"] = feedparser.USER_AGENT
+    # No DTD/entity expansion or network access while parsing untrusted feeds
+    _XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
+
+class _TextExtractor(HTMLParser):
+    """Collects the text of an HTML fragment, skipping script and style."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in _BREAK_TAGS:
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip = max(self._skip - 1, 0)
+        elif tag in _BREAK_TAGS:
+            self.parts.append(" ")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def _to_text(markup):
+    """Reduce an HTML fragment (or plain text) to its whitespace-collapsed text.
+
+    Both parsers run titles and summaries through this, so headlines carry
+    plain text whichever one read the feed, and no feed markup reaches the
+    LLM prompt or the CSV export.
+    """
+    if "<" not in markup:
+        text = html.unescape(markup) if "&" in markup else markup
+    else:
+        parser = _TextExtractor()
+        parser.feed(markup)
+        parser.close()
+        text = "".join(parser.parts)
+    return " ".join(text.split())
+
+
+def _inner_markup(el):
+    """Return an element's content as markup, including any child elements."""
+    if el is None:
+        return ""
+    if not len(el):
+        return el.text or ""
+    return (el.text or "") + "".join(etree.tostring(child, encoding="unicode") for child in el)
+
+
 # Feed list carried over from polymarket_default_detector.py
 DEFAULT_FEEDS = {
     "CoinDesk": "https://www.coindesk.com/arc/outboundfeeds/rss/",
@@ -27,31 +107,127 @@ class RSSSignalSource(SignalSource):
 
     def __init__(self, feeds=None, delay=0.5):
         self.feeds = feeds or dict(DEFAULT_FEEDS)
-        self.delay = delay
+        self.delay = delay  # seconds between requests to the same host
 
     def fetch(self):
-        """Fetch all feeds and return a flat list of headline dicts."""
-        headlines = []
+        """Fetch all feeds and return a flat list of headline dicts.
+
+        Hosts are fetched concurrently; feeds sharing a host are fetched in
+        turn, ``delay`` seconds apart. Output keeps the feed order.
+        """
+        by_host = {}
         for source_name, url in self.feeds.items():
-            logger.debug("Fetching %s", source_name)
-            headlines.extend(self._parse_feed(url, source_name))
-            if self.delay:
-                time.sleep(self.delay)
+            by_host.setdefault(urlsplit(url).netloc, []).append((source_name, url))
+        if not by_host:
+            return []
+
+        def fetch_host(feeds):
+            parsed = {}
+            for i, (source_name, url) in enumerate(feeds):
+                if i and self.delay:
+                    time.sleep(self.delay)
+                logger.debug("Fetching %s", source_name)
+                parsed[source_name] = self._parse_feed(url, source_name)
+            return parsed
+
+        per_feed = {}
+        with ThreadPoolExecutor(max_workers=min(len(by_host), MAX_FEED_WORKERS)) as pool:
+            for parsed in pool.map(fetch_host, by_host.values()):
+                per_feed.update(parsed)
+
+        headlines = []
+        for source_name in self.feeds:
+            headlines.extend(per_feed.get(source_name, []))
         return headlines
 
     # ── internals (lifted from polymarket_default_detector.py) ──────
 
     def _parse_feed(self, url, source_name):
+        if etree is None:
+            return self._parse_with_feedparser(url, source_name)
+        try:
+            resp = _SESSION.get(url, timeout=FEED_TIMEOUT)
+            resp.raise_for_status()
+        except Exception as e:
+            logger.warning("Error fetching %s: %s", source_name, e)
+            return []
+        try:
+            articles = self._parse_xml(resp.content, source_name)
+        except Exception as e:
+            logger.debug("lxml could not parse %s (%s) — falling back to feedparser", source_name, e)
+            articles = None
+        if not articles:
+            # Unusual dialects (RDF, broken markup) or an empty feed
+            return self._parse_with_feedparser(resp.content, source_name)
+        return articles
+
+    @classmethod
+    def _parse_xml(cls, content, source_name):
+        """Extract articles from RSS 2.0 or Atom bytes with lxml."""
+        root = etree.fromstring(content, _XML_PARSER)
+        articles = []
+        for item in root.iterfind(".//item"):
+            url = (item.findtext("link") or "").strip()
+            if not url:
+                # RSS guids are permalinks unless marked otherwise
+                guid = item.find("guid")
+                if guid is not None and guid.get("isPermaLink", "true").lower() != "false":
+                    url = (guid.text or "").strip()
+            articles.append({
+                "title": _to_text(_inner_markup(item.find("title"))),
+                "url": url,
+                "published": cls._iso_timestamp(item.findtext("pubDate"), rfc822=True),
+                "summary": _to_text(_inner_markup(item.find("description"))),
+                "source": source_name,
+            })
+        if articles:
+            return articles
+        for entry in root.iterfind(f".//{ATOM_NS}entry"):
+            link = ""
+            for el in entry.iterfind(f"{ATOM_NS}link"):
+                if el.get("rel", "alternate") == "alternate":
+                    link = el.get("href", "")
+                    break
+            summary = entry.find(f"{ATOM_NS}summary")
+            if summary is None:
+                summary = entry.find(f"{ATOM_NS}content")
+            articles.append({
+                "title": _to_text(_inner_markup(entry.find(f"{ATOM_NS}title"))),
+                "url": link,
+                "published": cls._iso_timestamp(
+                    entry.findtext(f"{ATOM_NS}published") or entry.findtext(f"{ATOM_NS}updated"),
+                    rfc822=False,
+                ),
+                "summary": _to_text(_inner_markup(summary)),
+                "source": source_name,
+            })
+        return articles
+
+    @staticmethod
+    def _iso_timestamp(value, rfc822):
+        """Normalise a feed date to the UTC, second-resolution ISO form feedparser yields."""
+        if value:
+            try:
+                value = value.strip()
+                dt = parsedate_to_datetime(value) if rfc822 else datetime.fromisoformat(value)
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=timezone.utc)
+                return dt.astimezone(timezone.utc).replace(microsecond=0).isoformat()
+            except (TypeError, ValueError):
+                pass
+        return datetime.now(timezone.utc).isoformat()
+
+    def _parse_with_feedparser(self, url_or_content, source_name):
         try:
-            feed = feedparser.parse(url)
+            feed = feedparser.parse(url_or_content)
             articles = []
             for entry in feed.entries:
                 articles.append(
                     {
-                        "title": entry.get("title", ""),
+                        "title": _to_text(entry.get("title", "")),
                         "url": entry.get("link", ""),
                         "published": self._parse_timestamp(entry),
-                        "summary": entry.get("summary", ""),
+                        "summary": _to_text(entry.get("summary", "")),
                         "source": source_name,
                     }
                 )
@@ -62,6 +238,7 @@ class RSSSignalSource(SignalSource):
 
     @staticmethod
     def _parse_timestamp(entry):
-        if hasattr(entry, "published_parsed") and entry.published_parsed:
-            return datetime(*entry.published_parsed[:6], tzinfo=timezone.utc).isoformat()
+        parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+        if parsed:
+            return datetime(*parsed[:6], tzinfo=timezone.utc).isoformat()
         return datetime.now(timezone.utc).isoformat()
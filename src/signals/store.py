@@ -1,25 +1,91 @@
-import json
+import atexit
 import logging
+import mmap
+import os
+import sys
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import orjson
+from sortedcontainers import SortedList
+
+from src._paths import DATA_DIR
 
 from .base import SignalSource
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data"
-CACHE_FILENAME = "headlines.json"
+DEFAULT_CACHE_DIR = DATA_DIR
+CACHE_FILENAME = "headlines.jsonl"
+META_FILENAME = "headlines_meta.json"
+LEGACY_CACHE_FILENAME = "headlines.json"  # pre-JSONL cache, migrated on first load
+WRITE_BUFFER_SIZE = 1 << 16
+MAX_SOURCE_WORKERS = 8
+TRACKING_PARAMS = frozenset({"ref", "fbclid"})  # plus any utm_* param
+
+# Stores with a background save possibly in flight, flushed at exit. Weak, so
+# a store that goes out of scope can still be collected.
+_live_stores = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_stores():
+    for store in list(_live_stores):
+        try:
+            store.flush()
+        except Exception as e:
+            logger.warning("Failed to save headlines to %s: %s", store.cache_path, e)
+
+
+def _canon(url):
+    """Return the dedup key for ``url``.
+
+    Scheme and host are lower-cased, and the fragment and tracking query
+    params are dropped, so tagged links to the same article collapse into one.
+    """
+    parts = urlsplit(url)
+    query = parts.query
+    if query:
+        query = urlencode([
+            (k, v) for k, v in parse_qsl(query, keep_blank_values=True)
+            if k not in TRACKING_PARAMS and not k.startswith("utm_")
+        ])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
 
 
 class SignalStore:
-    """Collects headlines from multiple SignalSources, deduplicates by URL,
-    and persists them to a local JSON file."""
+    """Collects headlines from multiple SignalSources, deduplicates by
+    canonical URL, and persists them to a local JSON Lines file (one
+    headline per line)."""
 
     def __init__(self, sources=None, cache_dir=None):
         self.sources = list(sources or [])
         self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
         self.cache_path = self.cache_dir / CACHE_FILENAME
-        self._headlines = {}  # url -> headline dict
+        self.meta_path = self.cache_dir / META_FILENAME
+        self.legacy_cache_path = self.cache_dir / LEGACY_CACHE_FILENAME
+        self._headlines = {}  # canonical url (also stored as h["key"]) -> headline dict
+        self._urls = []  # canonical urls, in insertion order
+        # (published, -position in _urls), kept sorted as headlines arrive so
+        # recency reads never sort; ties go to the earlier headline
+        self._by_published = SortedList()
+        self._dirty = []  # headlines added since the last save
+        self._lines = 0  # lines in the cache file, including duplicates
+        self._loaded_key = None  # (mtime_ns, size) of the cache file _headlines reflects
+        # Saves run on a background writer; the lock guards the cache file,
+        # _dirty and _lines against it
+        self._io_lock = threading.RLock()
+        # Writer state: the thread only lives while saves are pending
+        self._writer_lock = threading.Lock()
+        self._writer_thread = None
+        self._save_pending = False
+        self._idle = threading.Event()
+        self._idle.set()
+        self._write_error = None
 
     def add_source(self, source):
         if not isinstance(source, SignalSource):
@@ -29,36 +95,131 @@ class SignalStore:
     # ── Public API ──────────────────────────────────────────────────
 
     def refresh(self):
-        """Fetch from all sources, deduplicate, merge with cache, and save.
+        """Fetch from all sources, deduplicate, merge with cache, and queue a save.
 
         Returns the number of *new* headlines added this refresh.
         """
         self.load()
-        before = len(self._headlines)
+        fetched = [h for batch in self._fetch_all() for h in batch]
+        # One fetch timestamp for the whole refresh
+        now_iso = datetime.now(timezone.utc).isoformat()
 
-        for source in self.sources:
-            for h in source.fetch():
-                url = h.get("url")
-                if not url or url in self._headlines:
+        added = []
+        intern = sys.intern
+        canon = _canon
+        contains = self._headlines.__contains__
+        add = self._add
+        with self._io_lock:
+            for h in fetched:
+                # Sources always set "url" (see SignalSource.fetch), though it may be empty
+                try:
+                    url = h["url"]
+                except KeyError:
                     continue
-                h["fetched_at"] = datetime.now(timezone.utc).isoformat()
-                self._headlines[url] = h
+                if not url:
+                    continue
+                key = intern(canon(url))
+                if contains(key):
+                    continue
+                h["url"] = intern(url)
+                h["key"] = key
+                h["fetched_at"] = now_iso
+                add(key, h)
+                added.append(h)
+            self._dirty.extend(added)
 
-        new_count = len(self._headlines) - before
-        self._save()
+        # Written in the background; with nothing added only the poll time is recorded
+        new_count = len(added)
+        self._schedule_save()
         logger.info("Added %d new headlines (%d total)", new_count, len(self._headlines))
         return new_count
 
+    def flush(self):
+        """Block until any scheduled save has been written.
+
+        Re-raises the error from a background save that failed since the
+        last flush.
+        """
+        self._idle.wait()
+        error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+
     def load(self):
         """Load previously cached headlines from disk."""
-        if not self.cache_path.exists():
+        with self._io_lock:
+            self._load()
+
+    def _load(self):
+        try:
+            st = os.stat(self.cache_path)
+        except FileNotFoundError:
+            if self.legacy_cache_path.exists():
+                self._migrate_legacy()
+            return
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._loaded_key:
+            logger.debug("Headline cache unchanged, keeping %d loaded headlines", len(self._headlines))
             return
-        with open(self.cache_path, "r") as f:
-            data = json.load(f)
+        headlines, urls = self._headlines, self._urls
+        by_published = []  # added to the sorted index in one batch below
+        lines = 0
+        torn = False
+        rekeyed = False
+        loads = orjson.loads
+        with open(self.cache_path, "rb") as f:
+            if not st.st_size:
+                self._lines = 0
+                self._loaded_key = stamp
+                return
+            # orjson parses each line straight out of the mapping, so the file
+            # is never copied into one big bytes object first
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                # A complete append always ends in a newline, so anything after
+                # the last one is a torn write
+                end = mm.rfind(b"\n") + 1
+                if mm[end:].strip():
+                    logger.warning("Dropping truncated last headline in %s", self.cache_path)
+                    torn = True
+                find = mm.find
+                start = 0
+                while start < end:
+                    stop = find(b"\n", start, end)
+                    if stop > start:
+                        h = loads(view[start:stop])
+                        lines += 1
+                        url = h.get("url")
+                        key = h.get("key")
+                        if key is None and url:
+                            # Written before keys were stored; compacted below so
+                            # this only happens once
+                            h["key"] = key = _canon(url)
+                            rekeyed = True
+                        if key and key not in headlines:
+                            if url == key:
+                                h["url"] = key  # share one string when already canonical
+                            # Inlined _add, batching the sorted-index inserts
+                            headlines[key] = h
+                            by_published.append((h.get("published") or "", -len(urls)))
+                            urls.append(key)
+                    start = stop + 1
+        self._by_published.update(by_published)
+        self._lines = lines
+        self._loaded_key = stamp
+        if torn or rekeyed:
+            self._compact()
+
+    def _migrate_legacy(self):
+        """Convert the old single-document headlines.json into the JSONL cache."""
+        data = orjson.loads(self.legacy_cache_path.read_bytes())
         for h in data.get("headlines", []):
             url = h.get("url")
             if url:
-                self._headlines[url] = h
+                h["key"] = key = _canon(url)
+                if key not in self._headlines:
+                    self._add(key, h)
+        self._compact()
+        logger.info("Migrated %d headlines from %s", len(self._headlines), self.legacy_cache_path)
 
     @property
     def count(self):
@@ -70,20 +231,110 @@ class SignalStore:
 
     def get_most_recent(self, n=5):
         """Return the N most recently published headlines."""
-        return sorted(
-            self._headlines.values(),
-            key=lambda h: h.get("published", ""),
-            reverse=True,
-        )[:n]
+        if n <= 0:
+            return []
+        urls, headlines = self._urls, self._headlines
+        return [headlines[urls[-pos]] for _, pos in reversed(self._by_published[-n:])]
 
     # ── Internal ────────────────────────────────────────────────────
 
+    def _add(self, key, h):
+        self._headlines[key] = h
+        self._by_published.add((h.get("published") or "", -len(self._urls)))
+        self._urls.append(key)
+
+    def _fetch_all(self):
+        """Fetch every source concurrently (each is network-bound), in source order."""
+        if len(self.sources) <= 1:
+            return [source.fetch() for source in self.sources]
+        workers = min(len(self.sources), MAX_SOURCE_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda source: source.fetch(), self.sources))
+
+    def _schedule_save(self):
+        """Queue a save for the writer thread, coalescing with one already pending."""
+        with self._writer_lock:
+            self._save_pending = True
+            if self._writer_thread is None:
+                self._idle.clear()
+                _live_stores.add(self)
+                self._writer_thread = threading.Thread(
+                    target=self._write_pending, name="signal-store-writer", daemon=True,
+                )
+                self._writer_thread.start()
+
+    def _write_pending(self):
+        """Writer thread: save until nothing is pending, then exit."""
+        while True:
+            with self._writer_lock:
+                if not self._save_pending:
+                    self._writer_thread = None
+                    self._idle.set()
+                    return
+                self._save_pending = False  # the save picks up everything in _dirty
+            try:
+                self._save()
+            except Exception as e:
+                logger.warning("Failed to save headlines to %s: %s", self.cache_path, e)
+                self._write_error = e
+
     def _save(self):
+        """Append headlines added since the last save, compacting if needed."""
+        with self._io_lock:
+            self._save_locked()
+
+    def _save_locked(self):
+        if self._lines + len(self._dirty) > 2 * len(self._headlines):
+            # Duplicate lines (e.g. from concurrent refreshes) outnumber live ones
+            self._compact()
+            return
+        if self._dirty:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, "ab", buffering=WRITE_BUFFER_SIZE) as f:
+                f.writelines(self._encode(self._dirty))
+            self._lines += len(self._dirty)
+            self._mark_loaded()
+            self._dirty = []
+        self._save_meta()
+
+    def _compact(self):
+        """Rewrite the cache with exactly one line per live headline."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Swap in a fully written file so a crash can't leave a torn cache
+        tmp = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            with open(tmp, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+                f.writelines(self._encode(list(self._headlines.values())))
+            os.replace(tmp, self.cache_path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        self._lines = len(self._headlines)
+        self._mark_loaded()
+        self._dirty = []
+        self._save_meta()
+
+    def _mark_loaded(self):
+        """Record that the in-memory headlines match the cache as just written."""
+        st = os.stat(self.cache_path)
+        self._loaded_key = (st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    def _encode(headlines):
+        """Yield one JSON line per headline.
+
+        Lines are streamed through the file's fixed-size write buffer rather
+        than joined, so a save never allocates a copy of everything it writes.
+        """
+        dumps = orjson.dumps
+        opts = orjson.OPT_APPEND_NEWLINE
+        for h in headlines:
+            yield dumps(h, default=str, option=opts)
+
+    def _save_meta(self):
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        payload = {
+        meta = {
             "updated_at": datetime.now(timezone.utc).isoformat(),
             "count": len(self._headlines),
-            "headlines": list(self._headlines.values()),
         }
-        with open(self.cache_path, "w") as f:
-            json.dump(payload, f, indent=2, default=str)
+        self.meta_path.write_bytes(orjson.dumps(meta))
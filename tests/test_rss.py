@@ -0,0 +1,75 @@
+"""The lxml fast path must produce the same headlines as feedparser."""
+
+import pytest
+
+pytest.importorskip("feedparser")
+pytest.importorskip("lxml")
+pytest.importorskip("requests")
+
+from src.signals.rss import RSSSignalSource  # noqa: E402
+
+RSS_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Fixture</title>
+<item>
+  <title>Fed &amp; rates <b>rise</b></title>
+  <link>https://example.com/fed</link>
+  <pubDate>Tue, 02 Jan 2024 10:00:00 +0000</pubDate>
+  <description>&lt;p&gt;Hello &lt;script&gt;alert(1)&lt;/script&gt;world&lt;/p&gt;</description>
+</item>
+<item>
+  <title>Permalink guid only</title>
+  <guid isPermaLink="true">https://example.com/guid</guid>
+  <pubDate>Tue, 02 Jan 2024 11:00:00 GMT</pubDate>
+  <description>plain text</description>
+</item>
+<item>
+  <title>Default guid</title>
+  <guid>https://example.com/default-guid</guid>
+  <pubDate>Tue, 02 Jan 2024 12:00:00 +0100</pubDate>
+</item>
+<item>
+  <title>Opaque guid</title>
+  <guid isPermaLink="false">tag-123</guid>
+  <pubDate>Tue, 02 Jan 2024 13:00:00 +0000</pubDate>
+</item>
+<item>
+  <title><![CDATA[AT&amp;T   beats <i>estimates</i>]]></title>
+  <link> https://example.com/att </link>
+  <pubDate>Tue, 02 Jan 2024 14:00:00 +0000</pubDate>
+  <description><![CDATA[<img src="x" onerror="y()">Shares <a href="https://z">jump</a><br/>after hours]]></description>
+</item>
+</channel></rss>
+"""
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Fixture</title>
+<entry>
+  <title type="html">Oil &lt;em&gt;slides&lt;/em&gt; 3%</title>
+  <link rel="alternate" href="https://example.com/oil"/>
+  <published>2024-01-02T10:00:00Z</published>
+  <summary type="html">&lt;p&gt;Crude &amp;amp; Brent&lt;/p&gt;</summary>
+</entry>
+<entry>
+  <title>Plain entry</title>
+  <link rel="self" href="https://example.com/self"/>
+  <link href="https://example.com/plain"/>
+  <updated>2024-01-02T11:30:00+02:00</updated>
+  <content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml"><p>Body <b>text</b></p></div></content>
+</entry>
+</feed>
+"""
+
+
+@pytest.mark.parametrize("content", [RSS_FEED, ATOM_FEED], ids=["rss", "atom"])
+def test_lxml_matches_feedparser(content):
+    source = RSSSignalSource(feeds={})
+    fast = RSSSignalSource._parse_xml(content, "Fixture")
+    slow = source._parse_with_feedparser(content, "Fixture")
+    assert fast == slow
+
+
+def test_markup_is_reduced_to_text():
+    first, second = RSSSignalSource._parse_xml(RSS_FEED, "Fixture")[:2]
+    assert first["title"] == "Fed & rates rise"
+    assert first["summary"] == "Hello world"
+    assert second["url"] == "https://example.com/guid"